@@ -89,9 +89,9 @@ public struct CardView : View {
         // The default cards are the classic SET Game ones.
         // - Original ones from Java based SET Game circa 1999.
         // The ALTD_ cards are the rectangle color based ones.
-        // - See ios-setgame/etc/alternate_cards/alternate_cards_analogous.py
+        // - See ios-setgame/etc/alternate_cards/specs/analogous.json
         // The ALTNC_ cards are the monochrome (no-color) based ones.
-        // - See ios-setgame/etc/alternate_cards/alternate_cards_no_colors.py
+        // - See ios-setgame/etc/alternate_cards/specs/no_colors.json
         //
         let alternateCards: Int = self.alternate ?? self.table.settings.alternateCards;
         // switch self.table.settings.alternateCards {
@@ -0,0 +1,39 @@
+"""
+Card image generators for the SetGame asset catalog.
+
+Each card variant is a spec file in specs/ (see spec.py), named by its
+VARIANTS entry: cards() yields the (code, attributes) of every card in deck
+order and card_display_list(**attributes) returns one's draw.py display
+list. Importing the package (or loading a variant) has no side effects and
+does not import PIL; use the CLI to render and write the images:
+
+    python -m alternate_cards build --variant ALTD,ALTNC --out DIR
+    python -m alternate_cards icons --out DIR
+    python -m alternate_cards vector --variant ALTD,ALTNC --out DIR
+    python -m alternate_cards layers --variant ALTD --out DIR
+    python -m alternate_cards recolor --variant ALTD --prefix ALTDK --map SRC=DST --out DIR
+    python -m alternate_cards plan --variant ALTD,ALTNC --out DIR
+    python -m alternate_cards sync --variant ALTD,ALTNC --source DIR --out DIR
+
+or iter_deck() to stream a deck's images one card at a time:
+
+    for code, attributes, image in alternate_cards.iter_deck("ALTD", scale=2):
+        ...
+"""
+
+# Variant name (image name prefix) to spec file name.
+VARIANTS = {
+    "ALTA":  "color_color_color_color.json",
+    "ALTB":  "color_shape_color_number.json",
+    "ALTC":  "analogous.json",
+    "ALTD":  "boxes.json",
+    "ALTNC": "no_colors.json",
+}
+
+def iter_deck(variant, codes=None, **params):
+    """
+    Lazily yield (code, attributes, PIL image) for each card of the variant,
+    or only of the given codes; see deck.iter_deck.
+    """
+    from .deck import iter_deck
+    return iter_deck(variant, codes, **params)
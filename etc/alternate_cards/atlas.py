@@ -0,0 +1,106 @@
+"""
+Texture atlas export for whole decks.
+
+pack_atlas() packs the cards of a variant into one image with a shelf
+packer: cards are taken tallest first (deck order among equals) and placed
+left to right on shelves no wider than the square root of their total
+area, so the layout depends only on the card sizes and codes.
+
+build_atlas() pastes the cards' images from the asset catalog into
+{VARIANT}_ATLAS.imageset (one image per scale, the same layout scaled) and
+writes the index, mapping each card code to its [x, y, width, height] rect
+in points (1x pixels), to {VARIANT}_ATLAS.dataset/{VARIANT}_ATLAS.json for
+the app to load with NSDataAsset. The app can then decode one image per
+deck rather than one per card.
+"""
+
+import json
+import math
+import os
+
+# Gap between cards (in points), filled with the background, so that sampling
+# a card's edge pixels does not bleed in its neighbours.
+PADDING = 2
+ATLAS_SUFFIX = "_ATLAS"
+
+def pack_atlas(sizes, padding=PADDING):
+    """
+    Shelf-pack the given list of (code, (width, height)) and return the
+    atlas (width, height) and a dictionary of (x, y, width, height) by code.
+    """
+
+    if not sizes:
+        return (0, 0), {}
+
+    order = sorted(range(len(sizes)), key=lambda index: (-sizes[index][1][1], index))
+    area = sum((width + padding) * (height + padding) for _, (width, height) in sizes)
+    shelf_width = max(max(width for _, (width, _) in sizes) + padding, math.ceil(math.sqrt(area)))
+
+    rects = {}
+    x = y = shelf_height = atlas_width = 0
+    for index in order:
+        code, (width, height) = sizes[index]
+        if x > 0 and x + width + padding > shelf_width:
+            x, y, shelf_height = 0, y + shelf_height, 0
+        rects[code] = (x, y, width, height)
+        atlas_width = max(atlas_width, x + width)
+        shelf_height = max(shelf_height, height + padding)
+        x += width + padding
+
+    return (atlas_width, y + shelf_height - padding), rects
+
+def dataset_contents(filename):
+    """
+    Return the Contents.json text of a dataset holding the given file,
+    formatted as Xcode writes it.
+    """
+    contents = {"data": [{"filename": filename, "idiom": "universal"}], "info": {"author": "xcode", "version": 1}}
+    return json.dumps(contents, indent=2, separators=(",", " : ")) + "\n"
+
+def atlas_files(directory, variant, scales):
+    from .deck import image_filename
+    name = f"{variant}{ATLAS_SUFFIX}"
+    return ([f"{directory}/{name}.imageset/{image_filename(name, scale)}" for scale in sorted(scales)]
+            + [f"{directory}/{name}.dataset/{name}.json"])
+
+def build_atlas(directory, variant, codes, scales, background="white"):
+    """
+    Pack the images of the given card codes (in deck order) from the asset
+    catalog directory into the variant's atlas imageset and index dataset
+    there, and return the number of files written.
+    """
+
+    from PIL import Image
+    from .deck import _encode_png, _write_if_changed, catalog_imageset, image_filename, imageset_contents
+
+    name = f"{variant}{ATLAS_SUFFIX}"
+
+    def card_file(code, scale):
+        return f"{directory}/{code}.imageset/{image_filename(code, scale)}"
+
+    scale = min(scales)
+    sizes = []
+    for code in codes:
+        with Image.open(card_file(code, scale)) as image:
+            sizes.append((code, (image.width // scale, image.height // scale)))
+    (width, height), rects = pack_atlas(sizes)
+
+    written = 0
+    imageset = catalog_imageset(directory, name)
+    for scale in sorted(scales):
+        atlas = Image.new("RGB", (width * scale, height * scale), background)
+        for code in codes:
+            x, y, _, _ = rects[code]
+            with Image.open(card_file(code, scale)) as image:
+                atlas.paste(image.convert("RGB"), (x * scale, y * scale))
+        written += _write_if_changed(f"{imageset}/{image_filename(name, scale)}", _encode_png(atlas))
+    written += _write_if_changed(f"{imageset}/Contents.json", imageset_contents(name, scales).encode())
+
+    index = {"image": name, "size": [width, height], "scales": sorted(scales),
+             "cards": {code: list(rects[code]) for code in codes}}
+    dataset = f"{directory}/{name}.dataset"
+    os.makedirs(dataset, exist_ok=True)
+    written += _write_if_changed(f"{dataset}/{name}.json", (json.dumps(index, indent=1) + "\n").encode())
+    written += _write_if_changed(f"{dataset}/Contents.json", dataset_contents(f"{name}.json").encode())
+
+    return written
@@ -0,0 +1,269 @@
+"""
+Benchmarks for the draw.py primitives, single cards and whole decks.
+
+    python -m alternate_cards.benchmark [border] [backend] [primitives] [cards]
+                                        [--json FILE] [--quick]
+    python -m alternate_cards.benchmark compare BASELINE CURRENT [--threshold 0.1]
+
+With no names, primitives and cards are run. Each benchmark prints a table;
+--json also writes every measurement to FILE, keyed by benchmark name and
+parameters (e.g. "primitive/circle/size=60/border=4/aa=4"), and compare
+reads two such files and flags each time that grew by more than threshold
+(a fraction), exiting with status 1 if any did. Times are the best of a few
+repeats, in milliseconds.
+
+border: renders the circle, square and rounded rectangle primitives with both
+BORDER_MODE "rings" (one 1-px outline per supersampled pixel of thickness) and
+"inset" (outer shape in the border color, then inset shape in the fill color)
+across a range of border thicknesses, and reports the time per sprite, the
+speedup, and the per-channel pixel difference between the two.
+
+"rings" is the default. Squares are identical; rounded rectangles differ
+on a few corner-arc pixels. Circles differ wherever the "rings" strokes
+leave moire gaps between concentric ellipse outlines (the fill color shows
+through the border), which "inset" fills solidly, so the difference grows
+with thickness and is visible on the circle cards. Differences are measured
+on sprites composited onto white.
+
+backend: renders each primitive with BACKEND "pil" (aa=4 supersample plus
+LANCZOS) and "numpy" (analytic coverage at output resolution) at card and
+icon sizes, and reports the time per sprite, the scratch pixels each needs
+and the per-channel difference between the two.
+
+primitives: renders each primitive's sprite (bypassing the sprite cache) and
+_draw_number across sizes, border thicknesses and aa factors.
+
+cards: per variant, the time to render one card (its display list to an
+image) at each scale, cold (draw.py's sprite, stamp and template caches
+emptied before each repeat; the "ms" compare reads) and warm (every stamp
+already cached, so little more than pasting), and the time, cards per
+second and peak memory (max RSS, in a freshly spawned worker process per
+variant) of a 1x deck build with PNG encoding.
+"""
+
+import argparse
+import json
+import multiprocessing
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image, ImageChops, ImageStat
+from . import VARIANTS, draw
+
+BORDER_THICKNESSES = [1, 2, 4, 8, 12, 16, 24]
+BORDER_SHAPES = {
+    "circle":    lambda border, mode: draw._render_circle(78, "#9C3327", border, "white", 4, mode),
+    "square":    lambda border, mode: draw._render_square(78, "#9C3327", border, "white", 4, mode),
+    "rectangle": lambda border, mode: draw._render_rectangle(142, 51, "#9C3327", border, "white", 0.2, 4, mode),
+}
+
+BACKEND_SHAPES = {
+    "circle":    lambda size, render: render(size // 2, "#9C3327", size // 16, "white", 4),
+    "square":    lambda size, render: render(size // 2, "#9C3327", size // 16, "white", 4),
+    "triangle":  lambda size, render: render(size // 2, "#9C3327", size // 16, "white", 4),
+    "rectangle": lambda size, render: render(size, size * 51 // 142, "#9C3327", size // 16, "white", 0.2, 4),
+    "diamond":   lambda size, render: render(size, size * 60 // 144, "#9C3327", size // 16, "white", 4),
+}
+BACKEND_SIZES = [60, 142, 512, 1024]
+
+PRIMITIVE_SHAPES = {
+    "circle":    lambda size, border, aa: draw._render_circle(size // 2, "#9C3327", border, "white", aa, draw.BORDER_MODE),
+    "square":    lambda size, border, aa: draw._render_square(size // 2, "#9C3327", border, "white", aa, draw.BORDER_MODE),
+    "triangle":  lambda size, border, aa: draw._render_triangle(size // 2, "#9C3327", border, "white", aa),
+    "rectangle": lambda size, border, aa: draw._render_rectangle(size, size * 51 // 142, "#9C3327", border, "white", 0.2, aa, draw.BORDER_MODE),
+    "diamond":   lambda size, border, aa: draw._render_diamond(size, size * 60 // 144, "#9C3327", border, "white", aa),
+}
+PRIMITIVE_SIZES = [30, 60, 142]
+PRIMITIVE_BORDERS = [0, 4, 10]
+PRIMITIVE_AA = [2, 4, 8]
+CARD_SCALES = [1, 2, 3]
+CARD_SAMPLE = 9
+
+def _time(func, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def _flatten(sprite):
+    # Compare sprites as they appear pasted onto a white card.
+    background = Image.new("RGBA", sprite.size, "white")
+    return Image.alpha_composite(background, sprite).convert("RGB")
+
+def _difference(a, b):
+    diff = ImageChops.difference(_flatten(a), _flatten(b))
+    max_diff = max(high for low, high in diff.getextrema())
+    mean_diff = sum(ImageStat.Stat(diff).mean) / len(diff.getbands())
+    return max_diff, mean_diff
+
+def benchmark_border(quick=False):
+    results = {}
+    print(f"{'shape':<10} {'border':>6} {'rings ms':>9} {'inset ms':>9} {'speedup':>8} {'max diff':>9} {'mean diff':>10}")
+    for shape, render in BORDER_SHAPES.items():
+        for border in BORDER_THICKNESSES:
+            rings = _time(lambda: render(border, "rings"))
+            inset = _time(lambda: render(border, "inset"))
+            max_diff, mean_diff = _difference(render(border, "rings"), render(border, "inset"))
+            print(f"{shape:<10} {border:>6} {rings * 1000:>9.2f} {inset * 1000:>9.2f} "
+                  f"{rings / inset:>7.1f}x {max_diff:>9} {mean_diff:>10.3f}")
+            results[f"border/{shape}/border={border}/rings"] = {"ms": rings * 1000}
+            results[f"border/{shape}/border={border}/inset"] = {"ms": inset * 1000}
+    return results
+
+def benchmark_backend(quick=False):
+    results = {}
+    print(f"{'shape':<10} {'size':>5} {'pil ms':>8} {'numpy ms':>9} {'speedup':>8} {'pil px':>10} {'numpy px':>9} {'max diff':>9} {'mean diff':>10}")
+    for shape, render in BACKEND_SHAPES.items():
+        pil = draw._get_renderer(shape, "pil")
+        numpy = draw._get_renderer(shape, "numpy")
+        for size in BACKEND_SIZES:
+            pil_time = _time(lambda: render(size, pil), repeat=3)
+            numpy_time = _time(lambda: render(size, numpy), repeat=3)
+            sprite = render(size, numpy)
+            max_diff, mean_diff = _difference(render(size, pil), sprite)
+            pixels = sprite.size[0] * sprite.size[1]
+            print(f"{shape:<10} {size:>5} {pil_time * 1000:>8.2f} {numpy_time * 1000:>9.2f} "
+                  f"{pil_time / numpy_time:>7.1f}x {pixels * 16:>10} {pixels:>9} {max_diff:>9} {mean_diff:>10.3f}")
+            results[f"backend/{shape}/size={size}/pil"] = {"ms": pil_time * 1000}
+            results[f"backend/{shape}/size={size}/numpy"] = {"ms": numpy_time * 1000}
+    return results
+
+def benchmark_primitives(quick=False):
+    results = {}
+    sizes = PRIMITIVE_SIZES[1:2] if quick else PRIMITIVE_SIZES
+    print(f"{'shape':<10} {'size':>5} {'border':>6} {'aa':>3} {'ms':>8}")
+    for shape, render in PRIMITIVE_SHAPES.items():
+        for size in sizes:
+            for border in PRIMITIVE_BORDERS:
+                for aa in PRIMITIVE_AA:
+                    elapsed = _time(lambda: render(size, border, aa), repeat=3)
+                    print(f"{shape:<10} {size:>5} {border:>6} {aa:>3} {elapsed * 1000:>8.3f}")
+                    results[f"primitive/{shape}/size={size}/border={border}/aa={aa}"] = {"ms": elapsed * 1000}
+    for size in sizes:
+        image = Image.new("RGB", (size * 2, size * 2), "white")
+        draw._load_font.cache_clear()
+        draw._fit_font.cache_clear()
+        cold = _time(lambda: draw._draw_number(image, size, size, size // 2, "black", 7), repeat=1)
+        warm = _time(lambda: draw._draw_number(image, size, size, size // 2, "black", 7))
+        print(f"{'number':<10} {size:>5} {'-':>6} {'-':>3} {warm * 1000:>8.3f} (first call {cold * 1000:.3f})")
+        results[f"primitive/number/size={size}"] = {"ms": warm * 1000, "first_ms": cold * 1000}
+    return results
+
+def _clear_caches():
+    draw._clear_sprite_cache()
+    draw._template_cache.clear()
+
+def _render_cards(display_lists, scale, cold):
+    if cold:
+        _clear_caches()
+    for display_list in display_lists:
+        draw._render_display_list(display_list, scale=scale)
+
+def _deck_benchmark(variant):
+    # Runs in a freshly spawned worker process (a forked one would start
+    # with this one's RSS), so max RSS is this deck's peak.
+    from .deck import build_deck
+    start = time.perf_counter()
+    results = build_deck(variant, jobs=1, scales=(1,))
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return elapsed, len(results), peak // 1024 if sys.platform == "darwin" else peak
+
+def benchmark_cards(quick=False):
+    from .deck import _variant_spec
+    results = {}
+    print(f"{'variant':<8} {'scale':>5} {'cold ms':>9} {'warm ms':>9}")
+    for variant in VARIANTS:
+        module = _variant_spec(variant)
+        cards = list(module.cards())
+        cards = cards[::max(1, len(cards) // CARD_SAMPLE)][:CARD_SAMPLE]
+        display_lists = [module.card_display_list(**attributes) for _, attributes in cards]
+        for scale in CARD_SCALES[:1] if quick else CARD_SCALES:
+            cold = _time(lambda: _render_cards(display_lists, scale, True), repeat=3) / len(display_lists)
+            warm = _time(lambda: _render_cards(display_lists, scale, False), repeat=3) / len(display_lists)
+            print(f"{variant:<8} {scale:>5} {cold * 1000:>9.2f} {warm * 1000:>9.2f}")
+            results[f"card/{variant}/scale={scale}"] = {"ms": cold * 1000, "warm_ms": warm * 1000}
+    print(f"{'variant':<8} {'cards':>5} {'deck ms':>9} {'cards/s':>8} {'peak MB':>8}")
+    for variant in VARIANTS:
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+            elapsed, count, peak = executor.submit(_deck_benchmark, variant).result()
+        print(f"{variant:<8} {count:>5} {elapsed * 1000:>9.1f} {count / elapsed:>8.1f} {peak / 1024:>8.1f}")
+        results[f"deck/{variant}"] = {"ms": elapsed * 1000, "cards_per_second": count / elapsed, "peak_kb": peak}
+    return results
+
+def compare(baseline, current, threshold=0.1):
+    """
+    Print the change in time of every measurement in both results files and
+    return the names of those that got slower by more than threshold.
+    """
+    with open(baseline) as f:
+        baseline = json.load(f)
+    with open(current) as f:
+        current = json.load(f)
+    regressions = []
+    print(f"{'benchmark':<48} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name in sorted(set(baseline) & set(current)):
+        before, after = baseline[name]["ms"], current[name]["ms"]
+        change = (after - before) / before if before else 0.0
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<48} {before:>10.3f} {after:>10.3f} {change * 100:>+7.1f}%{flag}")
+    for name, results, other in [("baseline", baseline, current), ("current", current, baseline)]:
+        missing = set(results) - set(other)
+        if missing:
+            print(f"{len(missing)} benchmark(s) only in {name}")
+    return regressions
+
+BENCHMARKS = {
+    "border": benchmark_border,
+    "backend": benchmark_backend,
+    "primitives": benchmark_primitives,
+    "cards": benchmark_cards,
+}
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+
+    if argv[:1] == ["compare"]:
+        parser = argparse.ArgumentParser(prog="python -m alternate_cards.benchmark compare")
+        parser.add_argument("baseline", help="baseline results file (from --json)")
+        parser.add_argument("current", help="current results file (from --json)")
+        parser.add_argument("--threshold", "-t", type=float, default=0.1,
+                            help="slowdown (fraction) reported as a regression (default: 0.1)")
+        args = parser.parse_args(argv[1:])
+        regressions = compare(args.baseline, args.current, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.threshold * 100:.0f}%")
+            return 1
+        return 0
+
+    parser = argparse.ArgumentParser(prog="python -m alternate_cards.benchmark")
+    parser.add_argument("names", nargs="*", metavar="name",
+                        help=f"benchmarks to run: {', '.join(BENCHMARKS)} (default: primitives cards)")
+    parser.add_argument("--json", "-o", metavar="FILE", help="write the results to FILE as JSON")
+    parser.add_argument("--quick", "-q", action="store_true", help="fewer sizes and scales")
+    args = parser.parse_args(argv)
+
+    names = args.names or ["primitives", "cards"]
+    for name in names:
+        if name not in BENCHMARKS:
+            parser.error(f"unknown benchmark: {name} (expected one of: {', '.join(BENCHMARKS)})")
+
+    results = {}
+    for name in names:
+        results.update(BENCHMARKS[name](args.quick))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=1, sort_keys=True)
+            f.write("\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
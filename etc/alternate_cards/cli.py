@@ -0,0 +1,309 @@
+"""
+Command line interface for the card generators.
+
+    python -m alternate_cards build [--variant ALTD,ALTNC] [--out DIR] [--jobs N]
+                                    [--scales 1,2,3] [--manifest FILE] [--force] [--report]
+                                    [--atlas] [--profile] [--profile-json FILE] [--store [DIR]]
+    python -m alternate_cards icons [--out DIR]
+    python -m alternate_cards vector [--variant ALTD,ALTNC] [--out DIR] [--format pdf|svg]
+    python -m alternate_cards layers [--variant ALTD] [--out DIR] [--scales 1,2,3]
+    python -m alternate_cards recolor --variant ALTD --prefix ALTDK --map SRC=DST [--map SRC=DST ...]
+                                      [--source DIR] [--out DIR] [--scales 1,2,3] [--no-tint]
+    python -m alternate_cards plan [--variant ALTD,ALTNC] [--scales 1,2,3] [--out DIR]
+    python -m alternate_cards sync --source DIR [--variant ALTD,ALTNC] [--out DIR] [--manifest FILE] [--no-prune]
+
+build renders the named variants (default: the ones the app uses) into the
+asset catalog at DIR as {code}.imageset/{code}.png, {code}@2x.png and
+{code}@3x.png (see deck.py), plus its Contents.json. All variants are built in
+this one process, with one pool of worker processes shared between them, so
+fonts and sprites are loaded once per worker rather than once per variant.
+With --jobs 1 each deck is built by the threaded render -> encode -> write
+pipeline in pipeline.py instead.
+PIL is not imported until a build starts.
+
+Builds are incremental: a manifest (by default DIR/.alternate_cards_manifest.json)
+records the hash of each card's render inputs and PNG bytes, cards whose inputs
+are unchanged are not rendered, and files whose bytes are unchanged are not
+written. --force renders every card (unchanged files are still not written).
+--atlas also packs each variant's cards into one {VARIANT}_ATLAS image with
+a JSON index of the card rects (see atlas.py); it is repacked only when a
+card was written or an atlas file is missing.
+--report prints, per variant, the PNG bytes saved and the Pillow decode time
+compared with default RGB encoding (see deck.py) for the cards rendered,
+and the pipeline's per-stage times.
+--profile prints the time, scratch pixels and resizes of each draw.py
+primitive and card at the end of the build (see instrument.py), and
+--profile-json writes them to FILE.
+--store reads sprites and cards rasterized by earlier builds from the
+on-disk sprite store in DIR (default ~/.cache/alternate_cards, under
+$XDG_CACHE_HOME if set) and adds the ones it rasterizes (see store.py).
+
+vector writes each card as one single-page PDF (or SVG) with "Preserve
+Vector Data" on, in place of its PNGs, from the same display lists (see
+vector.py).
+
+layers writes, instead of a deck's cards, grayscale coverage layers per
+shape, filling and number and a JSON recipe for tinting them in the app
+(see layers.py).
+
+recolor writes a themed copy of a built variant under a new code prefix by
+remapping the colors of its images (see recolor.py), e.g. for a dark deck:
+--map white=#202020 --map black=white. It does not render.
+
+plan prints how many templates, figures and figure geometries the cards of
+the variants share (see plan.py) and, with --out, renders them through one
+plan, rasterizing each stamp the variants share once, into the asset
+catalog at DIR (without a manifest). build renders each deck through a
+plan too.
+
+sync copies the variants' imagesets from a build output (e.g. a build --out
+into a scratch directory) into the asset catalog at DIR, creating missing
+imagesets and their Contents.json, writing only files whose bytes changed
+(atomically), and pruning the imagesets of cards the variants no longer
+have (see sync.py).
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from . import VARIANTS
+from .manifest import MANIFEST_NAME
+
+# Variants referenced by SetGame/Views/CardView.swift.
+DEFAULT_VARIANTS = [ "ALTD", "ALTNC" ]
+DEFAULT_CATALOG = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "SetGame", "Assets.xcassets"))
+DEFAULT_ICONS = os.path.join(DEFAULT_CATALOG, "LogicardIcon.appiconset")
+
+def _variant_list(value):
+    variants = [variant.strip().upper() for variant in value.split(",") if variant.strip()]
+    for variant in variants:
+        if variant not in VARIANTS:
+            raise argparse.ArgumentTypeError(f"unknown variant: {variant} (expected one of: {', '.join(VARIANTS)})")
+    return variants
+
+def _scale_list(value):
+    try:
+        scales = sorted({int(scale) for scale in value.split(",") if scale.strip()})
+    except ValueError:
+        scales = []
+    if not scales or any(scale not in [1, 2, 3] for scale in scales):
+        raise argparse.ArgumentTypeError(f"invalid scales: {value} (expected some of: 1,2,3)")
+    return scales
+
+def _print_report(variant, report):
+    saved = report["rgb_bytes"] - report["bytes"]
+    print(f"{variant}: {report['images']} images ({report['palette']} palette), "
+          f"{report['bytes']} bytes vs {report['rgb_bytes']} RGB "
+          f"({saved} saved, {100.0 * saved / max(1, report['rgb_bytes']):.0f}%), "
+          f"decode {report['decode'] * 1000:.1f} ms vs {report['rgb_decode'] * 1000:.1f} ms RGB", file=sys.stderr)
+
+def _print_stages(variant, stages):
+    for name, stage in stages.items():
+        print(f"{variant}: {name:<6} {stage['items']:>4} items, busy {stage['busy'] * 1000:>8.1f} ms, "
+              f"waiting for input {stage['waiting_input'] * 1000:>8.1f} ms, "
+              f"for output {stage['waiting_output'] * 1000:>8.1f} ms", file=sys.stderr)
+
+def build(variants, out, jobs, manifest_path=None, force=False, report=False, scales=None, atlas=False,
+          profile=False, profile_json=None, store=None):
+    if profile or profile_json:
+        # Must be set before draw.py is first imported (here and in workers).
+        os.environ["ALTERNATE_CARDS_PROFILE"] = "1"
+    if store:
+        os.environ["ALTERNATE_CARDS_STORE"] = store
+    from . import instrument
+    from .atlas import build_atlas, atlas_files
+    from .deck import SCALES, build_deck, build_extras, write_deck, catalog_files, card_inputs, encoding_report
+    from .manifest import Manifest
+    manifest = Manifest(manifest_path or os.path.join(out, MANIFEST_NAME))
+    scales = tuple(scales or SCALES)
+    jobs = max(1, jobs or os.cpu_count() or 1)
+    executor = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    try:
+        for variant in variants:
+            inputs = card_inputs(VARIANTS[variant], scales)
+            skip = set() if force else {code for code, input_hash in inputs.items()
+                                        if manifest.unchanged(code, input_hash, catalog_files(out, code, scales))}
+            stages = None
+            if executor is None:
+                from .pipeline import build_deck_pipelined
+                results, written, stages = build_deck_pipelined(VARIANTS[variant], out, skip=skip, scales=scales)
+            else:
+                results = build_deck(VARIANTS[variant], jobs=jobs, executor=executor, skip=skip, scales=scales)
+                written = write_deck(results, out)
+            for code, images in results:
+                manifest.record(code, inputs[code], images)
+            written += write_deck(build_extras(VARIANTS[variant], scales), out)
+            if atlas and (written or force or not all(map(os.path.exists, atlas_files(out, variant, scales)))):
+                written += build_atlas(out, variant, list(inputs), scales)
+            print(f"{variant}: {len(inputs)} cards, {len(results)} rendered, {written} written", file=sys.stderr)
+            if report and results:
+                _print_report(variant, encoding_report(results))
+                if stages:
+                    _print_stages(variant, stages)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        manifest.save()
+    if profile:
+        instrument.report()
+    if profile_json:
+        instrument.write_json(profile_json)
+
+def vector(variants, out, format="pdf"):
+    from .vector import write_vector_deck
+    for variant in variants:
+        written = write_vector_deck(out, variant, format)
+        print(f"{variant}: {written} written", file=sys.stderr)
+
+def layers(variants, out, scales=None):
+    from .deck import SCALES
+    from .layers import export_layers
+    for variant in variants:
+        written = export_layers(out, variant, tuple(scales or SCALES))
+        print(f"{variant}: {written} written", file=sys.stderr)
+
+def _color_map(value):
+    source, separator, destination = value.partition("=")
+    if not separator or not source.strip() or not destination.strip():
+        raise argparse.ArgumentTypeError(f"invalid color mapping: {value} (expected SRC=DST)")
+    return source.strip(), destination.strip()
+
+def recolor(variant, prefix, mapping, source, out=None, scales=None, tint=True):
+    from .deck import SCALES
+    from .recolor import TINT, recolor_deck
+    written = recolor_deck(source, variant, prefix, dict(mapping), tuple(scales or SCALES),
+                           out, TINT if tint else None)
+    print(f"{prefix}: {written} written", file=sys.stderr)
+
+def plan(variants, scales=None, out=None):
+    from .deck import SCALES, write_deck
+    from .plan import compile_plan, render_plan
+    compiled = compile_plan(variants, tuple(scales or SCALES))
+    summary = compiled.summary()
+    print(f"{','.join(variants)}: {summary['cards']} cards, {summary['templates']} templates, "
+          f"{summary['instances']} figures of {summary['figures']} distinct figures, "
+          f"{summary['geometries']} geometries", file=sys.stderr)
+    if out:
+        for variant, results in render_plan(compiled).items():
+            print(f"{variant}: {write_deck(results, out)} written", file=sys.stderr)
+        print(f"{','.join(variants)}: {compiled.summary()['stamps']} stamps rasterized", file=sys.stderr)
+
+def sync(variants, source, out, prune=True, manifest_path=None):
+    from .sync import sync_catalog
+    for variant, result in sync_catalog(source, out, variants, prune, manifest_path).items():
+        print(f"{variant}: {result['imagesets']} imagesets, {result['written']} written, "
+              f"{result['pruned']} pruned", file=sys.stderr)
+        if result["missing"]:
+            print(f"{variant}: not in {source}: {' '.join(result['missing'])}", file=sys.stderr)
+
+def icons(out):
+    from .icons import draw_icons
+    os.makedirs(out, exist_ok=True)
+    draw_icons(out)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m alternate_cards")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    parser_build = subparsers.add_parser("build", help="render card variants into an asset catalog")
+    parser_build.add_argument("--variant", "-v", type=_variant_list, default=DEFAULT_VARIANTS,
+                              help=f"comma-separated variants (default: {','.join(DEFAULT_VARIANTS)})")
+    parser_build.add_argument("--out", "-o", default=DEFAULT_CATALOG,
+                              help="asset catalog directory (default: SetGame/Assets.xcassets)")
+    parser_build.add_argument("--jobs", "-j", type=int, default=os.cpu_count(),
+                              help="number of worker processes (default: one per CPU)")
+    parser_build.add_argument("--scales", "-s", type=_scale_list, default=None,
+                              help="comma-separated image scales to render (default: 1,2,3)")
+    parser_build.add_argument("--manifest", "-m", default=None,
+                              help=f"build manifest file (default: {MANIFEST_NAME} in the --out directory)")
+    parser_build.add_argument("--force", "-f", action="store_true",
+                              help="render every card even if its inputs are unchanged")
+    parser_build.add_argument("--atlas", "-a", action="store_true",
+                              help="also pack each variant's cards into an atlas image with a JSON index")
+    parser_build.add_argument("--profile", "-p", action="store_true",
+                              help="print per-primitive and per-card draw.py stats at the end")
+    parser_build.add_argument("--profile-json", metavar="FILE", default=None,
+                              help="write per-primitive and per-card draw.py stats to FILE")
+    parser_build.add_argument("--report", "-r", action="store_true",
+                              help="report PNG size and decode time against default RGB encoding")
+    parser_build.add_argument("--store", nargs="?", const="1", default=None, metavar="DIR",
+                              help="use the on-disk sprite store in DIR (default: ~/.cache/alternate_cards)")
+
+    parser_icons = subparsers.add_parser("icons", help="render the app icons")
+    parser_icons.add_argument("--out", "-o", default=DEFAULT_ICONS,
+                              help="app icon set directory (default: SetGame/Assets.xcassets/LogicardIcon.appiconset)")
+
+    parser_vector = subparsers.add_parser("vector", help="write card variants as vector PDFs or SVGs")
+    parser_vector.add_argument("--variant", "-v", type=_variant_list, default=DEFAULT_VARIANTS,
+                               help=f"comma-separated variants (default: {','.join(DEFAULT_VARIANTS)})")
+    parser_vector.add_argument("--out", "-o", default=DEFAULT_CATALOG,
+                               help="asset catalog directory (default: SetGame/Assets.xcassets)")
+    parser_vector.add_argument("--format", choices=["pdf", "svg"], default="pdf",
+                               help="vector format (default: pdf)")
+
+    parser_layers = subparsers.add_parser("layers", help="export coverage layers and a tinting recipe")
+    parser_layers.add_argument("--variant", "-v", type=_variant_list, default=["ALTD"],
+                               help="comma-separated variants with one color per card (default: ALTD)")
+    parser_layers.add_argument("--out", "-o", default=DEFAULT_CATALOG,
+                               help="asset catalog directory (default: SetGame/Assets.xcassets)")
+    parser_layers.add_argument("--scales", "-s", type=_scale_list, default=None,
+                               help="comma-separated image scales to render (default: 1,2,3)")
+
+    parser_recolor = subparsers.add_parser("recolor", help="write a recolored copy of a built variant")
+    parser_recolor.add_argument("--variant", "-v", required=True, type=_variant_list,
+                                help="the variant to recolor, e.g. ALTD")
+    parser_recolor.add_argument("--prefix", "-p", required=True,
+                                help="code prefix of the recolored cards, e.g. ALTDK")
+    parser_recolor.add_argument("--map", "-c", dest="mapping", action="append", type=_color_map, required=True,
+                                metavar="SRC=DST", help="replace the color SRC (name or #RRGGBB) with DST; repeatable")
+    parser_recolor.add_argument("--source", default=DEFAULT_CATALOG,
+                                help="asset catalog holding the variant (default: SetGame/Assets.xcassets)")
+    parser_recolor.add_argument("--out", "-o", default=None,
+                                help="asset catalog to write to (default: the --source one)")
+    parser_recolor.add_argument("--scales", "-s", type=_scale_list, default=None,
+                                help="comma-separated image scales to recolor (default: 1,2,3)")
+    parser_recolor.add_argument("--no-tint", action="store_true",
+                                help="do not map the stripe tints of the mapped colors")
+
+    parser_plan = subparsers.add_parser("plan", help="show (and render) the figures the variants share")
+    parser_plan.add_argument("--variant", "-v", type=_variant_list, default=DEFAULT_VARIANTS,
+                             help=f"comma-separated variants (default: {','.join(DEFAULT_VARIANTS)})")
+    parser_plan.add_argument("--scales", "-s", type=_scale_list, default=None,
+                             help="comma-separated image scales (default: 1,2,3)")
+    parser_plan.add_argument("--out", "-o", default=None,
+                             help="asset catalog directory to render into (default: none, only print the plan)")
+
+    parser_sync = subparsers.add_parser("sync", help="sync the variants' imagesets from a build output into an asset catalog")
+    parser_sync.add_argument("--source", required=True,
+                             help="build output directory holding the imagesets")
+    parser_sync.add_argument("--variant", "-v", type=_variant_list, default=DEFAULT_VARIANTS,
+                             help=f"comma-separated variants (default: {','.join(DEFAULT_VARIANTS)})")
+    parser_sync.add_argument("--out", "-o", default=DEFAULT_CATALOG,
+                             help="asset catalog directory (default: SetGame/Assets.xcassets)")
+    parser_sync.add_argument("--manifest", "-m", default=None,
+                             help=f"the catalog's build manifest (default: {MANIFEST_NAME} in the --out directory)")
+    parser_sync.add_argument("--no-prune", action="store_true",
+                             help="keep the imagesets of cards the variants no longer have")
+
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        build(args.variant, args.out, args.jobs, args.manifest, args.force, args.report, args.scales, args.atlas,
+              args.profile, args.profile_json, args.store)
+    elif args.command == "icons":
+        icons(args.out)
+    elif args.command == "vector":
+        vector(args.variant, args.out, args.format)
+    elif args.command == "layers":
+        layers(args.variant, args.out, args.scales)
+    elif args.command == "recolor":
+        if len(args.variant) != 1:
+            parser.error("recolor takes one --variant")
+        recolor(args.variant[0], args.prefix, args.mapping, args.source, args.out, args.scales, not args.no_tint)
+    elif args.command == "plan":
+        plan(args.variant, args.scales, args.out)
+    elif args.command == "sync":
+        sync(args.variant, args.source, args.out, not args.no_prune, args.manifest)
+
+if __name__ == "__main__":
+    sys.exit(main())
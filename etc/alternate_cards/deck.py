@@ -0,0 +1,270 @@
+"""
+Process-pool deck builder for the card variants (see VARIANTS).
+
+A variant (a spec compiled by spec.py) defines cards(), yielding (code,
+attributes) in deck order, and card_display_list(**attributes), returning
+the card's draw.py display list.
+build_deck() splits the card index space into contiguous shards, renders
+each card's display list at every requested scale (1x, 2x and 3x by
+default) to PNG bytes in a ProcessPoolExecutor, and returns the results in
+deck order, so the output is the same for any number of jobs.
+
+write_deck() writes the results into an asset catalog as CODE.png,
+CODE@2x.png and CODE@3x.png in CODE.imageset, with a Contents.json naming
+them, so iOS never has to resample the 1x image on Retina screens. PNGs
+are encoded without ancillary chunks, so the same pixels always give the
+same bytes (see manifest.py).
+
+Encoding: a card with at most 256 distinct colors (flat fills plus their
+antialiased edges) is written as an 8-bit palette PNG, provided the palette
+image converts back to exactly the same pixels; otherwise it is written as
+RGB. Both use optimize (zlib level 9). Palette cards are smaller than RGB
+ones and faster to decode; encoding_report() measures by how much, per
+deck. Pass one executor to several build_deck() calls to keep its workers
+(and their font and sprite caches) warm across variants.
+"""
+
+import functools
+import io
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from . import instrument
+from .manifest import render_inputs, card_input
+
+# Shards per worker; more than one so that a slow shard does not leave the
+# other workers idle at the end of a build.
+SHARDS_PER_JOB = 4
+
+# Scales rendered into each imageset by default.
+SCALES = (1, 2, 3)
+
+PNG_PALETTE = True
+PNG_OPTIMIZE = True
+
+def _palette_image(image):
+    from PIL import Image
+    if image.getcolors(256) is None:
+        return None
+    # Median cut keeps every color exactly when there are no more than 256;
+    # still check, since a lossy palette must never be written.
+    palette = image.quantize(256, method=Image.Quantize.MEDIANCUT, dither=Image.Dither.NONE)
+    if palette.convert(image.mode).tobytes() != image.tobytes():
+        return None
+    return palette
+
+def _encode_png(image, palette=None, optimize=None):
+    from PIL.PngImagePlugin import PngInfo
+    palette = PNG_PALETTE if palette is None else palette
+    optimize = PNG_OPTIMIZE if optimize is None else optimize
+    if palette and image.mode == "RGB":
+        image = _palette_image(image) or image
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", pnginfo=PngInfo(), optimize=optimize)
+    return buffer.getvalue()
+
+def _decode_time(png, repeat=3):
+    from PIL import Image
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        Image.open(io.BytesIO(png)).load()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+@functools.lru_cache(maxsize=None)
+def _variant_spec(variant):
+    # A VARIANTS name, or the name of a spec file (see spec.py) in specs/,
+    # compiled once per process.
+    from . import VARIANTS, spec
+    return spec.load(VARIANTS.get(variant, variant))
+
+def _render_images(display_list, scales):
+    from .draw import _render_display_list
+    return {scale: _encode_png(_render_display_list(display_list, scale=scale)) for scale in scales}
+
+def iter_deck(variant, codes=None, **params):
+    """
+    Lazily yield (code, attributes, image) for each card of the variant
+    (a VARIANTS name such as "ALTD", or its spec file name) in deck order,
+    rendering each card only when it is reached, so only one image is held
+    at a time. If codes is given only those cards are rendered, and the
+    generator stops after the last of them. Any params (scale, aa, backend)
+    are passed to draw._render_display_list.
+    """
+
+    from .draw import _render_display_list
+
+    module = _variant_spec(variant)
+    wanted = None if codes is None else set(codes)
+    for code, attributes in module.cards():
+        if wanted is not None:
+            if not wanted:
+                return
+            if code not in wanted:
+                continue
+            wanted.discard(code)
+        with instrument.card(code):
+            image = _render_display_list(module.card_display_list(**attributes), **params)
+        yield code, attributes, image
+
+def _render_shard(variant, indices, scales=SCALES):
+    # The shard's cards are rendered through one plan, so the stamps they
+    # share are rasterized once (see plan.py).
+    from .plan import Plan
+    module = _variant_spec(variant)
+    cards = list(module.cards())
+    plan = Plan(scales)
+    for code, attributes in map(cards.__getitem__, indices):
+        plan.add(variant, code, module.card_display_list(**attributes))
+    return [(code, {scale: _encode_png(image) for scale, image in images.items()})
+            for _, code, images in plan.render()]
+
+def _profiled_shard(variant, indices, scales=SCALES):
+    # Worker side of an instrumented build: return the shard's stats with it.
+    return _render_shard(variant, indices, scales), instrument.take()
+
+def _shards(indices, jobs):
+    size = max(1, -(-len(indices) // (jobs * SHARDS_PER_JOB)))
+    return [indices[start:start + size] for start in range(0, len(indices), size)]
+
+def card_inputs(variant, scales=SCALES):
+    """
+    Return a dictionary of the input hash (see manifest.py) of every card of
+    the named variant, by code, in deck order.
+    """
+    module = _variant_spec(variant)
+    inputs = render_inputs(module)
+    return {code: card_input(inputs, dict(attributes, scales=tuple(scales))) for code, attributes in module.cards()}
+
+def build_extras(variant, scales=SCALES):
+    """
+    Render the variant's extras() (other images it provides, as a list of
+    (code, display_list)) like build_deck does its cards.
+    """
+    module = _variant_spec(variant)
+    return [(code, _render_images(display_list, scales)) for code, display_list in module.extras()]
+
+def build_deck(variant, jobs=1, executor=None, skip=(), scales=SCALES):
+    """
+    Render every card of the named variant, except those whose codes
+    are in skip, and return a list of (code, images) in deck order, where
+    images is a dictionary of PNG bytes by scale, using up to jobs worker
+    processes, or the given executor (with jobs as its worker count) if any.
+    """
+
+    codes = [code for code, _ in _variant_spec(variant).cards()]
+    indices = [index for index, code in enumerate(codes) if code not in skip]
+    if not indices:
+        return []
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(indices)))
+
+    if jobs == 1:
+        return _render_shard(variant, indices, scales)
+
+    shards = _shards(indices, jobs)
+    if executor is None:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            return build_deck(variant, jobs, executor, skip, scales)
+    if instrument.ENABLED:
+        results = []
+        for shard, stats in executor.map(_profiled_shard, [variant] * len(shards), shards, [scales] * len(shards)):
+            instrument.merge(stats)
+            results.append(shard)
+    else:
+        results = executor.map(_render_shard, [variant] * len(shards), shards, [scales] * len(shards))
+    return [card for shard in results for card in shard]
+
+def encoding_report(results):
+    """
+    Compare the (code, images) results of build_deck with the same images
+    saved as default RGB PNGs and return a dictionary of the image count,
+    the number of palette images, the total bytes of each and the total
+    Pillow decode time (seconds) of each.
+    """
+    from PIL import Image
+    report = dict(images=0, palette=0, bytes=0, rgb_bytes=0, decode=0.0, rgb_decode=0.0)
+    for code, images in results:
+        for png in images.values():
+            image = Image.open(io.BytesIO(png))
+            rgb = _encode_png(image.convert("RGB"), palette=False, optimize=False)
+            report["images"] += 1
+            report["palette"] += image.mode == "P"
+            report["bytes"] += len(png)
+            report["rgb_bytes"] += len(rgb)
+            report["decode"] += _decode_time(png)
+            report["rgb_decode"] += _decode_time(rgb)
+    return report
+
+def image_filename(code, scale=1):
+    return f"{code}.png" if scale == 1 else f"{code}@{scale}x.png"
+
+def imageset_contents(code, scales):
+    """
+    Return the Contents.json text of an imageset holding the code's images
+    at the given scales, formatted as Xcode writes it.
+    """
+    images = []
+    for scale in sorted(set(SCALES) | set(scales)):
+        image = {"idiom": "universal", "scale": f"{scale}x"}
+        if scale in scales:
+            image = {"filename": image_filename(code, scale), **image}
+        images.append(image)
+    contents = {"images": images, "info": {"author": "xcode", "version": 1}}
+    return json.dumps(contents, indent=2, separators=(",", " : ")) + "\n"
+
+def _write_if_changed(file, data):
+    try:
+        with open(file, "rb") as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    # Written to a temporary file and renamed, so a reader (or Xcode) never
+    # sees a half-written file.
+    directory, name = os.path.split(file)
+    fd, temporary = tempfile.mkstemp(dir=directory or ".", prefix=f".{name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(temporary, 0o644)
+        os.replace(temporary, file)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+    print(file)
+    return True
+
+def write_deck(results, directory):
+    """
+    Write the (code, images) results of build_deck into the asset catalog
+    directory, as the imageset's images plus its Contents.json, skipping
+    files that already hold the same bytes, and return the number of files
+    written.
+    """
+    written = 0
+    for code, images in results:
+        imageset = catalog_imageset(directory, code)
+        for scale, png in sorted(images.items()):
+            written += _write_if_changed(f"{imageset}/{image_filename(code, scale)}", png)
+        written += _write_if_changed(f"{imageset}/Contents.json", imageset_contents(code, images).encode())
+    return written
+
+def catalog_imageset(directory, code):
+    """
+    Return the path of the code's imageset in the asset catalog directory,
+    i.e. {directory}/{code}.imageset, creating it if needed.
+    """
+    imageset = f"{directory}/{code}.imageset"
+    os.makedirs(imageset, exist_ok=True)
+    return imageset
+
+def catalog_files(directory, code, scales=SCALES):
+    """
+    Return the paths of the code's images at the given scales in the asset
+    catalog directory.
+    """
+    return [f"{directory}/{code}.imageset/{image_filename(code, scale)}" for scale in sorted(scales)]
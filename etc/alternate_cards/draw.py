@@ -1,102 +1,576 @@
+import hashlib
 import math
+import os
+from collections import OrderedDict
+from functools import lru_cache, partial
 from PIL import Image, ImageDraw, ImageFont
 
+# Maximum number of finished (downsampled) sprites kept by the sprite cache;
+# a full deck only uses a few dozen distinct ones. Zero disables the cache.
+SPRITE_CACHE_SIZE = 1024
+
+# How _draw_circle, _draw_square and _draw_rectangle draw an INSIDE border:
+# "rings", the default, is the original one 1-px outline per supersampled
+# pixel of border thickness; "inset" fills the outer shape in the border
+# color and then the inset shape in the fill color (two operations
+# regardless of thickness). inset is opt-in: it fills the moire gaps rings
+# leave in circle borders, which visibly changes the shipped circle cards
+# (ALTA, ALTB, ALTNC), and is not measurably faster (see benchmark.py
+# border).
+BORDER_MODE = "rings"
+
+# Default rasterizer for the _draw_* primitives, overridable per call with
+# backend=...: "pil" supersamples by aa and downsamples with LANCZOS; "numpy"
+# computes analytic coverage at output resolution (see coverage.py).
+BACKEND = "pil"
+
+# Maximum number of card templates kept (see _get_template); a build needs
+# one per variant and scale, plus its downsampled copy when stamping, and a
+# 3x template is a 20 MB canvas.
+TEMPLATE_CACHE_SIZE = 8
+
+# Whether _render_display_list pastes each figure as a stamp (see _stamp)
+# onto the downsampled template, rather than painting the whole card on one
+# supersampled canvas. STAMP_MARGIN is the reach of the LANCZOS kernel in
+# output pixels: a figure changes pixels up to that far outside its box.
+STAMPS = True
+STAMP_MARGIN = 3
+
+# Whether stamps are composited from coverage masks cached per figure
+# geometry (see masks.py), so each shape is rasterized once for all colors
+# and fillings. Needs numpy; without it stamps are painted in full.
+STAMP_MASKS = True
+
+# Persistent sprite store (see store.py), used when the environment variable
+# ALTERNATE_CARDS_STORE is set (build --store sets it for the workers too).
+STORE = bool(os.environ.get("ALTERNATE_CARDS_STORE"))
+
+_sprite_cache = OrderedDict()
+_template_cache = OrderedDict()
+
 def _get_image_width(image):
     return image.size[0]
 
 def _get_image_height(image):
     return image.size[1]
 
-def _draw_circle(image, x, y, radius, color, border=0, border_color=None, aa=4):
+def _get_sprite(key, render):
+    """
+    Return the finished RGBA sprite for the given key (the full parameter tuple
+    of a primitive), calling render() to rasterize it only on a cache miss.
+    Least recently used sprites are evicted beyond SPRITE_CACHE_SIZE. With
+    STORE, a miss is looked up in the sprite store before rendering, and
+    what is rendered is stored.
 
-    r_hi = radius * aa
-    size = r_hi * 2
+    The returned sprite is shared; callers must not modify it.
+    """
 
-    # High-res temporary image
-    tmp = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    sprite = _sprite_cache.get(key)
+    if sprite is not None:
+        _sprite_cache.move_to_end(key)
+        return sprite
+
+    store = _sprite_store()
+    sprite = store.get(key) if store else None
+    if sprite is None:
+        sprite = render()
+        if store:
+            store.put(key, sprite)
+
+    if SPRITE_CACHE_SIZE > 0:
+        _sprite_cache[key] = sprite
+        while len(_sprite_cache) > SPRITE_CACHE_SIZE:
+            _sprite_cache.popitem(last=False)
+
+    return sprite
+
+@lru_cache(maxsize=None)
+def _sprite_store():
+    if not STORE:
+        return None
+    from . import store
+    return store.open_store(os.environ.get(store.STORE_ENV))
+
+def _get_renderer(shape, backend=None):
+    """
+    Return the sprite render function for the given shape and backend
+    (default BACKEND); the numpy backend is only imported when used.
+    """
+    if (backend or BACKEND) == "numpy":
+        from . import coverage
+        return getattr(coverage, f"render_{shape}")
+    return globals()[f"_render_{shape}"]
+
+def _clear_sprite_cache():
+    _sprite_cache.clear()
+
+class _DisplayList:
+    """
+    A card-sized stand-in for an image: the _draw_* primitives record their
+    calls on it (output-pixel top-left plus shape parameters) instead of
+    drawing, so _render_display_list can rasterize a whole card into one
+    shared supersampled layer with a single LANCZOS downsample.
+    """
+
+    def __init__(self, width, height, background="white"):
+        self.size = (width, height)
+        self.background = background
+        self.items = []
+
+def _render_display_list(display_list, aa=4, backend=None, scale=1):
+    """
+    Rasterize a _DisplayList into a new RGB image at scale times its size
+    (e.g. 2 and 3 for the @2x and @3x images, or any fraction, as for the app
+    icons), supersampled by aa at that scale. With STAMPS, each figure is
+    pasted as a cached stamp onto the downsampled card template instead of
+    downsampling the whole card; the pixels are the same. The numpy backend
+    does not supersample, so with it the items are drawn as individual
+    sprites. With STORE, a card rendered before is read from the sprite
+    store instead.
+    """
+
+    store = _sprite_store()
+    if store:
+        key = ("card", display_list.size, display_list.background, tuple(display_list.items),
+               aa, backend or BACKEND, scale, BORDER_MODE, STAMPS, STAMP_MASKS)
+        image = store.get(key)
+        if image is None:
+            image = _rasterize_display_list(display_list, aa, backend, scale)
+            store.put(key, image)
+        return image.copy()
+    return _rasterize_display_list(display_list, aa, backend, scale)
+
+def _rasterize_display_list(display_list, aa, backend, scale):
+    width, height = display_list.size
+    size = (int(round(width * scale)), int(round(height * scale)))
+
+    if (backend or BACKEND) == "numpy":
+        image = Image.new("RGB", size, display_list.background)
+        for item in display_list.items:
+            _replay_item(image, _scale_item(item, scale), aa, backend)
+        return image
+
+    image = _render_stamps(display_list, aa, scale)
+    if image is not None:
+        return image
+
+    k = aa * scale
+    count = _template_length(display_list)
+    tmp = _get_template(display_list, count, k)
     d = ImageDraw.Draw(tmp)
+    for item in display_list.items[count:]:
+        _paint_item(tmp, d, item, k)
 
-    # Filled circle
-    d.ellipse(
-        [0, 0, size - 1, size - 1],
-        fill=color
-    )
+    return tmp.resize(size, resample=Image.LANCZOS)
 
-    # Inner border
-    if border > 0 and border_color is not None:
-        for i in range(border * aa):
-            d.ellipse(
-                [
-                    i,
-                    i,
-                    size - 1 - i,
-                    size - 1 - i
-                ],
-                outline=border_color
-            )
+def _stamp_layout(display_list, aa, scale, backend=None):
+    """
+    Return the card's hi-res template, its downsampled copy and its figures
+    (see _figure_groups) if it can be rendered at scale by pasting stamps
+    onto the template (with STAMPS, and not with the numpy backend), or None.
+    """
+    if not STAMPS or (backend or BACKEND) == "numpy":
+        return None
+    width, height = display_list.size
+    size = (int(round(width * scale)), int(round(height * scale)))
+    k = aa * scale
+    # Stamps are cut from a template supersampled by exactly aa, so they only
+    # match the card canvas when that is too (not for the fractional icon
+    # scales).
+    if (int(round(width * k)), int(round(height * k))) != (size[0] * aa, size[1] * aa):
+        return None
+    count = _template_length(display_list)
+    template = _cached_template(display_list, count, k)
+    base = _cached_template(display_list, count, k, size)
+    return template, base, _figure_groups(display_list.items[count:], 2 * STAMP_MARGIN / scale)
+
+def _template_length(display_list):
+    """
+    Return the number of leading display list items that are full-card
+    rectangles, i.e. the card background and border every create_card_image()
+    starts with, which are the same for every card of a deck.
+    """
+    width, height = display_list.size
+    count = 0
+    for item in display_list.items:
+        if item[:5] != ("rectangle", 0, 0, width, height):
+            break
+        count += 1
+    return count
 
-    # Downsample for antialiasing
-    tmp = tmp.resize(
-        (radius * 2, radius * 2),
-        resample=Image.LANCZOS
+def _get_template(display_list, count, k):
+    """
+    Return a new hi-res (k times size) canvas with the display list's first
+    count items painted: a copy of a cached template (see _cached_template).
+    """
+    # A bare background is as cheap to create as to copy.
+    if count == 0 or TEMPLATE_CACHE_SIZE <= 0:
+        return _paint_template(display_list, count, k)
+    return _cached_template(display_list, count, k).copy()
+
+def _cached_template(display_list, count, k, size=None):
+    """
+    Return the hi-res canvas with the display list's first count items
+    painted, or if size is given that canvas downsampled to size, painted only
+    once per (size, background, items, k). Least recently used templates are
+    evicted beyond TEMPLATE_CACHE_SIZE.
+
+    The returned template is shared; callers must not modify it.
+    """
+
+    key = (display_list.size, display_list.background, tuple(display_list.items[:count]), k, size, BORDER_MODE)
+    template = _template_cache.get(key)
+    if template is not None:
+        _template_cache.move_to_end(key)
+        return template
+
+    if size is None:
+        template = _paint_template(display_list, count, k)
+    else:
+        template = _cached_template(display_list, count, k).resize(size, resample=Image.LANCZOS)
+
+    if TEMPLATE_CACHE_SIZE > 0:
+        _template_cache[key] = template
+        while len(_template_cache) > TEMPLATE_CACHE_SIZE:
+            _template_cache.popitem(last=False)
+
+    return template
+
+def _paint_template(display_list, count, k):
+    width, height = display_list.size
+    template = Image.new("RGB", (int(round(width * k)), int(round(height * k))), display_list.background)
+    d = ImageDraw.Draw(template)
+    for item in display_list.items[:count]:
+        _paint_item(template, d, item, k)
+    return template
+
+def _item_bounds(item):
+    """
+    Return the (left, top, right, bottom) box a display list item paints in.
+    """
+    shape, left, top, *params = item
+    if shape in ["circle", "square", "triangle"]:
+        return (left, top, left + 2 * params[0], top + 2 * params[0])
+    elif shape in ["rectangle", "diamond"]:
+        return (left, top, left + params[0], top + params[1])
+    elif shape == "number":
+        # (left, top) is the center; the text fits in 1.15 radius around it
+        extent = params[0] * 1.15
+        return (left - extent, top - extent, left + extent, top + extent)
+
+def _figure_groups(items, gap=0):
+    """
+    Split display list items into figures: sets of items whose boxes come
+    within gap of each other, directly or through other items, each kept in
+    drawing order. Figures do not overlap one another, so they can be drawn
+    in any order.
+    """
+    boxes = [_item_bounds(item) for item in items]
+    parent = list(range(len(items)))
+    def find(i):
+        while parent[i] != i:
+            i = parent[i]
+        return i
+    for i in range(len(items)):
+        for j in range(i):
+            if _boxes_touch(boxes[i], boxes[j], gap):
+                parent[find(i)] = find(j)
+    figures = {}
+    for i, item in enumerate(items):
+        figures.setdefault(find(i), []).append(item)
+    return list(figures.values())
+
+def _boxes_touch(a, b, gap=0):
+    return a[0] <= b[2] + gap and b[0] <= a[2] + gap and a[1] <= b[3] + gap and b[1] <= a[3] + gap
+
+def _translate_item(item, dx, dy):
+    shape, left, top, *params = item
+    return (shape, left + dx, top + dy, *params)
+
+def _render_stamps(display_list, aa, scale, stamps=None):
+    """
+    Return the card rendered by pasting the stamp of each of its figures
+    (see _stamp) onto its downsampled template, or None if it cannot be (see
+    _stamp_layout). Stamps are rasterized only on a sprite cache miss, and
+    first looked up in stamps, if given: a dictionary of them by key, which
+    keeps the ones this adds (see plan.Plan).
+    """
+    layout = _stamp_layout(display_list, aa, scale)
+    if layout is None:
+        return None
+    template, base, groups = layout
+    image = base.copy()
+    for group in groups:
+        key, position, render = _stamp(template, base, group, aa, scale)
+        stamp = stamps.get(key) if stamps is not None else None
+        if stamp is None:
+            stamp = _get_sprite(key, render)
+            if stamps is not None:
+                stamps[key] = stamp
+        image.paste(stamp, position)
+    return image
+
+def _stamp(template, base, items, aa, scale):
+    """
+    Return the key of the stamp for a figure (a group of display list items)
+    on the card's hi-res template (base being its downsampled copy), the
+    output-pixel position to paste it at, and a function rasterizing it. The
+    stamp is the antialiased RGB patch of the card holding the figure and
+    its LANCZOS fringe, rendered from the figure painted on the template
+    around it, out to the kernel's reach, so it has exactly the pixels
+    rendering the whole card would (with STAMP_MASKS, up to rounding; see
+    masks.py). The key is the items relative to the patch and the template
+    pixels under it, so a figure repeated within a card, or on cards that
+    differ only in how many figures they show or where, has one stamp.
+    """
+
+    width, height = template.size[0] // aa, template.size[1] // aa
+    boxes = [_item_bounds(item) for item in items]
+    left = max(0, int(math.floor(min(box[0] for box in boxes) * scale)) - STAMP_MARGIN)
+    top = max(0, int(math.floor(min(box[1] for box in boxes) * scale)) - STAMP_MARGIN)
+    right = min(width, int(math.ceil(max(box[2] for box in boxes) * scale)) + STAMP_MARGIN)
+    bottom = min(height, int(math.ceil(max(box[3] for box in boxes) * scale)) + STAMP_MARGIN)
+
+    # The template area the kernel reads for the stamp's pixels.
+    x0, y0 = max(0, left - STAMP_MARGIN), max(0, top - STAMP_MARGIN)
+    x1, y1 = min(width, right + STAMP_MARGIN), min(height, bottom + STAMP_MARGIN)
+    background = template.crop((x0 * aa, y0 * aa, x1 * aa, y1 * aa))
+    extrema = background.getextrema()
+    if all(low == high for low, high in extrema):
+        pixels = extrema
+    else:
+        pixels = hashlib.blake2b(background.tobytes(), digest_size=16).digest()
+    relative = tuple(_translate_item(item, -x0 / scale, -y0 / scale) for item in items)
+    crop = (left - x0, top - y0, right - x0, bottom - y0)
+
+    masks = _stamp_masks() if STAMP_MASKS else None
+    masked = masks is not None and masks.supported(relative)
+    if masked:
+        render = partial(_render_masked_stamp, base, (left, top, right, bottom), relative, (x1 - x0, y1 - y0), crop, aa, scale)
+    else:
+        render = partial(_render_stamp, background, relative, (x1 - x0, y1 - y0), crop, aa, scale)
+
+    key = ("stamp", relative, pixels, (x1 - x0, y1 - y0), crop, aa, scale, BORDER_MODE, masked)
+    return key, (left, top), render
+
+def _render_stamp(background, items, size, crop, aa, scale):
+    """
+    Rasterize a stamp (see _stamp): paint the items on the template patch
+    background, downsample it to size and crop it.
+    """
+    d = ImageDraw.Draw(background)
+    for item in items:
+        _paint_item(background, d, item, aa * scale)
+    patch = background.resize(size, resample=Image.LANCZOS)
+    return patch.crop(crop)
+
+def _render_masked_stamp(base, box, items, size, crop, aa, scale):
+    """
+    Rasterize a stamp (see _stamp) by compositing the coverage masks of the
+    items' geometry, cached per geometry, onto the box of base, the
+    downsampled template, under the stamp.
+    """
+    masks = _stamp_masks()
+    geometry, colors = masks.split_colors(items)
+    coverage = _get_sprite(
+        ("masks", geometry, len(colors), size, crop, aa, scale, BORDER_MODE),
+        lambda: masks.render_masks(geometry, len(colors), size, crop, aa, scale, _paint_item)
+    )
+    return masks.composite(coverage, colors, base.crop(box))
+
+@lru_cache(maxsize=None)
+def _stamp_masks():
+    try:
+        from . import masks
+    except ImportError:
+        return None
+    return masks
+
+def _paint_item(canvas, d, item, k):
+    shape, left, top, *params = item
+    if shape == "circle":
+        _paint_circle(d, left * k, top * k, *params, k, BORDER_MODE)
+    elif shape == "square":
+        _paint_square(d, left * k, top * k, *params, k, BORDER_MODE)
+    elif shape == "triangle":
+        radius, color, border, border_color, flip = params
+        _paint_triangle(d, left * k, top * k, radius, color, border, border_color, k, flip)
+    elif shape == "rectangle":
+        _paint_rectangle(d, left * k, top * k, *params, k, BORDER_MODE)
+    elif shape == "diamond":
+        _paint_diamond(d, left * k, top * k, *params, k)
+    elif shape == "number":
+        # (left, top) is the center for numbers. Like every other item, the
+        # digit is drawn at k times its size on the supersampled canvas, so
+        # its glyph is fitted, hinted and placed at that size: not the same
+        # pixels as drawing it on the finished 1x card.
+        radius, color, number = params
+        _draw_number(canvas, left * k, top * k, radius * k, color, number)
+
+def _scale_item(item, scale):
+    """
+    Return the display list item with its positions and sizes (including the
+    border thickness) multiplied by scale; positions and sizes are rounded
+    to whole pixels, since the sprites are.
+    """
+    if scale == 1:
+        return item
+    def s(value):
+        return int(round(value * scale))
+    shape, left, top, *params = item
+    if shape in ["circle", "square", "triangle"]:
+        radius, color, border, border_color, *rest = params
+        return (shape, s(left), s(top), s(radius), color, border * scale, border_color, *rest)
+    elif shape in ["rectangle", "diamond"]:
+        width, height, color, border, border_color, *rest = params
+        return (shape, s(left), s(top), s(width), s(height), color, border * scale, border_color, *rest)
+    elif shape == "number":
+        radius, color, number = params
+        return (shape, left * scale, top * scale, radius * scale, color, number)
+    return item
+
+def _replay_item(image, item, aa, backend):
+    shape, left, top, *params = item
+    if shape in ["circle", "square"]:
+        radius = params[0]
+        draw_function = {"circle": _draw_circle, "square": _draw_square}[shape]
+        draw_function(image, left + radius, top + radius, *params, aa=aa, backend=backend)
+    elif shape == "triangle":
+        radius, color, border, border_color, flip = params
+        _draw_triangle(image, left + radius, top + radius, radius, color, border, border_color,
+                       aa=aa, backend=backend, flip=flip)
+    elif shape in ["rectangle", "diamond"]:
+        width, height = params[0], params[1]
+        draw_function = {"rectangle": _draw_rectangle, "diamond": _draw_diamond}[shape]
+        draw_function(image, left + width // 2, top + height // 2, *params, aa=aa, backend=backend)
+    elif shape == "number":
+        _draw_number(image, left, top, *params)
+
+def _draw_circle(image, x, y, radius, color, border=0, border_color=None, aa=4, backend=None):
+
+    if isinstance(image, _DisplayList):
+        image.items.append(("circle", x - radius, y - radius, radius, color, border, border_color))
+        return
+
+    backend = backend or BACKEND
+    sprite = _get_sprite(
+        ("circle", radius, color, border, border_color, aa, BORDER_MODE, backend),
+        lambda: _get_renderer("circle", backend)(radius, color, border, border_color, aa, BORDER_MODE)
     )
 
     # Paste using alpha channel
     image.paste(
-        tmp,
+        sprite,
         (x - radius, y - radius),
-        tmp
+        sprite
     )
 
-def _draw_square(image, x, y, radius, color, border=0, border_color=None, aa=4):
-    """
-    Draw an antialiased filled square with optional INSIDE border.
-    """
+def _render_circle(radius, color, border=0, border_color=None, aa=4, border_mode="rings"):
 
-    r_hi = radius * aa
-    size = r_hi * 2
+    size = radius * aa * 2
 
     # High-res temporary image
     tmp = Image.new("RGBA", (size, size), (0, 0, 0, 0))
-    d = ImageDraw.Draw(tmp)
-
-    # Filled square
-    d.rectangle(
-        [0, 0, size - 1, size - 1],
-        fill=color
-    )
-
-    # Inner border (draw inward)
-    if border > 0 and border_color is not None:
-        for i in range(border * aa):
-            d.rectangle(
-                [
-                    i,
-                    i,
-                    size - 1 - i,
-                    size - 1 - i
-                ],
-                outline=border_color
-            )
+    _paint_circle(ImageDraw.Draw(tmp), 0, 0, radius, color, border, border_color, aa, border_mode)
 
     # Downsample for antialiasing
-    tmp = tmp.resize(
+    return tmp.resize(
         (radius * 2, radius * 2),
         resample=Image.LANCZOS
     )
 
+def _paint_circle(d, left, top, radius, color, border, border_color, k, border_mode="rings"):
+    """
+    Draw the (aliased) circle onto a high-res canvas at k times output size,
+    with its bounding box top-left at (left, top) in high-res pixels.
+    """
+
+    r_hi = radius * k
+    size = r_hi * 2
+
+    def bounds(i):
+        return [left + i, top + i, left + size - 1 - i, top + size - 1 - i]
+
+    if border > 0 and border_color is not None and border_mode == "inset":
+        # Outer circle in border color, inset circle in fill color
+        b_hi = border * k
+        d.ellipse(bounds(0), fill=border_color)
+        if b_hi < r_hi:
+            d.ellipse(bounds(b_hi), fill=color)
+    else:
+        # Filled circle
+        d.ellipse(bounds(0), fill=color)
+
+        # Inner border
+        if border > 0 and border_color is not None:
+            for i in range(int(round(border * k))):
+                d.ellipse(bounds(i), outline=border_color)
+
+def _draw_square(image, x, y, radius, color, border=0, border_color=None, aa=4, backend=None):
+    """
+    Draw an antialiased filled square with optional INSIDE border.
+    """
+
+    if isinstance(image, _DisplayList):
+        image.items.append(("square", x - radius, y - radius, radius, color, border, border_color))
+        return
+
+    backend = backend or BACKEND
+    sprite = _get_sprite(
+        ("square", radius, color, border, border_color, aa, BORDER_MODE, backend),
+        lambda: _get_renderer("square", backend)(radius, color, border, border_color, aa, BORDER_MODE)
+    )
+
     # Paste using alpha channel
     image.paste(
-        tmp,
+        sprite,
         (x - radius, y - radius),
-        tmp
+        sprite
     )
 
+def _render_square(radius, color, border=0, border_color=None, aa=4, border_mode="rings"):
+
+    size = radius * aa * 2
+
+    # High-res temporary image
+    tmp = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    _paint_square(ImageDraw.Draw(tmp), 0, 0, radius, color, border, border_color, aa, border_mode)
+
+    # Downsample for antialiasing
+    return tmp.resize(
+        (radius * 2, radius * 2),
+        resample=Image.LANCZOS
+    )
+
+def _paint_square(d, left, top, radius, color, border, border_color, k, border_mode="rings"):
+
+    r_hi = radius * k
+    size = r_hi * 2
+
+    def bounds(i):
+        return [left + i, top + i, left + size - 1 - i, top + size - 1 - i]
+
+    if border > 0 and border_color is not None and border_mode == "inset":
+        # Outer square in border color, inset square in fill color
+        b_hi = border * k
+        d.rectangle(bounds(0), fill=border_color)
+        if b_hi < r_hi:
+            d.rectangle(bounds(b_hi), fill=color)
+    else:
+        # Filled square
+        d.rectangle(bounds(0), fill=color)
+
+        # Inner border (draw inward)
+        if border > 0 and border_color is not None:
+            for i in range(int(round(border * k))):
+                d.rectangle(bounds(i), outline=border_color)
+
 def _draw_triangle(
     image, x, y, radius, color,
     border=0, border_color=None,
     aa=4,
-    flip=False
+    flip=False,
+    backend=None
 ):
     """
     Draw an antialiased filled equilateral triangle centered at (x, y),
@@ -107,13 +581,33 @@ def _draw_triangle(
     If flip=True, the triangle is upside-down.
     """
 
-    r_hi = radius * aa
-    size = r_hi * 2
+    if isinstance(image, _DisplayList):
+        image.items.append(("triangle", x - radius, y - radius, radius, color, border, border_color, flip))
+        return
+
+    backend = backend or BACKEND
+    sprite = _get_sprite(
+        ("triangle", radius, color, border, border_color, aa, flip, backend),
+        lambda: _get_renderer("triangle", backend)(radius, color, border, border_color, aa, flip)
+    )
+
+    # Paste onto main image using alpha
+    image.paste(sprite, (x - radius, y - radius), sprite)
+
+def _render_triangle(radius, color, border=0, border_color=None, aa=4, flip=False):
+
+    size = radius * aa * 2
 
     tmp = Image.new("RGBA", (size, size), (0, 0, 0, 0))
-    d = ImageDraw.Draw(tmp)
+    _paint_triangle(ImageDraw.Draw(tmp), 0, 0, radius, color, border, border_color, aa, flip)
 
-    cx = cy = r_hi  # center of the high-res temp canvas
+    # Downsample for antialiasing
+    return tmp.resize((radius * 2, radius * 2), resample=Image.LANCZOS)
+
+def _paint_triangle(d, left, top, radius, color, border, border_color, k, flip=False):
+
+    r_hi = radius * k
+    cx, cy = left + r_hi, top + r_hi  # center of the high-res bounding box
 
     def tri_points(R):
         # Point-up triangle
@@ -134,18 +628,12 @@ def _draw_triangle(
     if border > 0 and border_color is not None:
         d.polygon(tri_points(r_hi), fill=border_color)
 
-        inner_R = r_hi - border * aa
+        inner_R = r_hi - border * k
         if inner_R > 0:
             d.polygon(tri_points(inner_R), fill=color)
     else:
         d.polygon(tri_points(r_hi), fill=color)
 
-    # Downsample for antialiasing
-    tmp = tmp.resize((radius * 2, radius * 2), resample=Image.LANCZOS)
-
-    # Paste onto main image using alpha
-    image.paste(tmp, (x - radius, y - radius), tmp)
-
 def _old_draw_triangle(image, x, y, radius, color, border=0, border_color=None, aa=4):
     """
     Draw an antialiased filled equilateral triangle centered at (x, y),
@@ -189,7 +677,7 @@ def _old_draw_triangle(image, x, y, radius, color, border=0, border_color=None,
 
 def _draw_rectangle(image, x, y, width, height, color,
               border=0, border_color=None,
-              rounding=0.0, aa=4):
+              rounding=0.0, aa=4, backend=None):
     """
     Draw an antialiased filled rectangle centered at (x, y).
 
@@ -207,17 +695,38 @@ def _draw_rectangle(image, x, y, width, height, color,
     height = int(round(height))
     rounding = max(0.0, min(1.0, rounding))
 
+    if isinstance(image, _DisplayList):
+        image.items.append(("rectangle", int(x - width // 2), int(y - height // 2),
+                            width, height, color, border, border_color, rounding))
+        return
+
+    backend = backend or BACKEND
+    sprite = _get_sprite(
+        ("rectangle", width, height, color, border, border_color, rounding, aa, BORDER_MODE, backend),
+        lambda: _get_renderer("rectangle", backend)(width, height, color, border, border_color, rounding, aa, BORDER_MODE)
+    )
+
+    # Paste
+    image.paste(sprite, (int(x - width // 2), int(y - height // 2)), sprite)
+
+def _render_rectangle(width, height, color, border=0, border_color=None, rounding=0.0, aa=4, border_mode="rings"):
+
+    tmp = Image.new("RGBA", (width * aa, height * aa), (0, 0, 0, 0))
+    _paint_rectangle(ImageDraw.Draw(tmp), 0, 0, width, height, color, border, border_color, rounding, aa, border_mode)
+
+    # Downsample
+    return tmp.resize((width, height), resample=Image.LANCZOS)
+
+def _paint_rectangle(d, left, top, width, height, color, border, border_color, rounding, k, border_mode="rings"):
+
     # Maximum corner radius allowed (capsule limit)
     max_radius = min(width, height) / 2.0
     corner_radius = rounding * max_radius
 
     # Supersampled sizes
-    hi_w = width * aa
-    hi_h = height * aa
-    r_hi = corner_radius * aa
-
-    tmp = Image.new("RGBA", (hi_w, hi_h), (0, 0, 0, 0))
-    d = ImageDraw.Draw(tmp)
+    hi_w = width * k
+    hi_h = height * k
+    r_hi = corner_radius * k
 
     def draw_shape(bounds, fill=None, outline=None, rad=0):
         if rad > 0:
@@ -225,21 +734,25 @@ def _draw_rectangle(image, x, y, width, height, color,
         else:
             d.rectangle(bounds, fill=fill, outline=outline)
 
-    # Outer filled shape
-    outer = [0, 0, hi_w - 1, hi_h - 1]
-    draw_shape(outer, fill=color, rad=r_hi)
+    def bounds(i):
+        return [left + i, top + i, left + hi_w - 1 - i, top + hi_h - 1 - i]
 
-    # Inner border (drawn inward)
-    if border > 0 and border_color is not None:
-        b_hi = int(round(border * aa))
-        for i in range(b_hi):
-            bounds = [i, i, hi_w - 1 - i, hi_h - 1 - i]
-            rad_i = max(0.0, r_hi - i)
-            draw_shape(bounds, outline=border_color, rad=rad_i)
+    if border > 0 and border_color is not None and border_mode == "inset":
+        # Outer shape in border color, inset shape in fill color
+        b_hi = int(round(border * k))
+        draw_shape(bounds(0), fill=border_color, rad=r_hi)
+        if 2 * b_hi < min(hi_w, hi_h):
+            draw_shape(bounds(b_hi), fill=color, rad=max(0.0, r_hi - b_hi))
+    else:
+        # Outer filled shape
+        draw_shape(bounds(0), fill=color, rad=r_hi)
 
-    # Downsample and paste
-    tmp = tmp.resize((width, height), resample=Image.LANCZOS)
-    image.paste(tmp, (int(x - width // 2), int(y - height // 2)), tmp)
+        # Inner border (drawn inward)
+        if border > 0 and border_color is not None:
+            b_hi = int(round(border * k))
+            for i in range(b_hi):
+                rad_i = max(0.0, r_hi - i)
+                draw_shape(bounds(i), outline=border_color, rad=rad_i)
 
 def _draw_diamond(
     image,
@@ -250,7 +763,8 @@ def _draw_diamond(
     color,
     border=0,
     border_color=None,
-    aa=4
+    aa=4,
+    backend=None
 ):
     """
     Draw an antialiased diamond.
@@ -261,6 +775,7 @@ def _draw_diamond(
     - border: thickness of border in FINAL pixels (int or float)
     - border_color: color of border (if None, no border)
     - aa: antialiasing factor
+    - backend: "pil" or "numpy" (default BACKEND)
     """
 
     if width <= 0 or height <= 0:
@@ -270,15 +785,40 @@ def _draw_diamond(
     out_w = int(round(width))
     out_h = int(round(height))
 
-    # Hi-res size
-    hi_w = out_w * aa
-    hi_h = out_h * aa
+    if isinstance(image, _DisplayList):
+        image.items.append(("diamond", int(x - out_w // 2), int(y - out_h // 2),
+                            out_w, out_h, color, border, border_color))
+        return
 
-    tmp = Image.new("RGBA", (hi_w, hi_h), (0, 0, 0, 0))
-    d = ImageDraw.Draw(tmp)
+    backend = backend or BACKEND
+    sprite = _get_sprite(
+        ("diamond", out_w, out_h, color, border, border_color, aa, backend),
+        lambda: _get_renderer("diamond", backend)(out_w, out_h, color, border, border_color, aa)
+    )
 
-    cx = hi_w / 2.0
-    cy = hi_h / 2.0
+    # Paste centered
+    image.paste(
+        sprite,
+        (int(x - out_w // 2), int(y - out_h // 2)),
+        sprite
+    )
+
+def _render_diamond(out_w, out_h, color, border=0, border_color=None, aa=4):
+
+    tmp = Image.new("RGBA", (out_w * aa, out_h * aa), (0, 0, 0, 0))
+    _paint_diamond(ImageDraw.Draw(tmp), 0, 0, out_w, out_h, color, border, border_color, aa)
+
+    # Downsample for antialiasing
+    return tmp.resize((out_w, out_h), resample=Image.LANCZOS)
+
+def _paint_diamond(d, left, top, out_w, out_h, color, border, border_color, k):
+
+    # Hi-res size
+    hi_w = out_w * k
+    hi_h = out_h * k
+
+    cx = left + hi_w / 2.0
+    cy = top + hi_h / 2.0
 
     hw = hi_w / 2.0
     hh = hi_h / 2.0
@@ -295,7 +835,7 @@ def _draw_diamond(
     if border > 0 and border_color is not None:
         d.polygon(diamond_points(hw, hh), fill=border_color)
 
-        shrink = border * aa
+        shrink = border * k
         inner_hw = hw - shrink
         inner_hh = hh - shrink
 
@@ -307,16 +847,6 @@ def _draw_diamond(
     else:
         d.polygon(diamond_points(hw, hh), fill=color)
 
-    # Downsample for antialiasing
-    tmp = tmp.resize((out_w, out_h), resample=Image.LANCZOS)
-
-    # Paste centered
-    image.paste(
-        tmp,
-        (int(x - out_w // 2), int(y - out_h // 2)),
-        tmp
-    )
-
 def _old_draw_diamond(image, x, y, width, height, color, border=0, border_color=None, aa=4):
     """
     Antialiased diamond.
@@ -421,59 +951,81 @@ def _older_draw_diamond(image, x, y, radius, color, border=0, border_color=None,
     # paste centered at (x, y)
     image.paste(tmp, (x - out_w // 2, y - out_h // 2), tmp)
 
-def _draw_number(image, x, y, radius, color, number):
+# Bold TrueType fonts preferred (in order) by _draw_number: macOS first, then
+# the usual Linux locations; the first other *Bold.ttf found under
+# FONT_DIRECTORIES is used if none of these loads.
+FONT_CANDIDATES = [
+    "/System/Library/Fonts/Supplemental/Arial Bold.ttf",
+    "/System/Library/Fonts/Supplemental/Helvetica Bold.ttf",
+    "/System/Library/Fonts/Supplemental/Verdana Bold.ttf",
+    "/System/Library/Fonts/Supplemental/Trebuchet MS Bold.ttf",
+    "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
+    "/usr/share/fonts/liberation-sans/LiberationSans-Bold.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+    "/usr/share/fonts/dejavu/DejaVuSans-Bold.ttf",
+    "/usr/share/fonts/TTF/DejaVuSans-Bold.ttf",
+]
+FONT_DIRECTORIES = [
+    "/System/Library/Fonts",
+    "/Library/Fonts",
+    "~/Library/Fonts",
+    "/usr/share/fonts",
+    "/usr/local/share/fonts",
+    "~/.local/share/fonts",
+    "~/.fonts",
+]
+
+def _bold_font_paths():
+    # FONT_CANDIDATES, then the bold fonts under FONT_DIRECTORIES, walked
+    # only as far as they are needed.
+    yield from FONT_CANDIDATES
+    for directory in FONT_DIRECTORIES:
+        for root, _, files in sorted(os.walk(os.path.expanduser(directory))):
+            for file in sorted(files):
+                if file.lower().endswith(("bold.ttf", "bold.otf")):
+                    yield os.path.join(root, file)
+
+@lru_cache(maxsize=None)
+def _bold_font():
     """
-    Draw a bold number centered inside the circle of radius `radius`
-    around (x, y). Text color = `color`.
+    Return the path of the first bold font that loads, or None; discovered
+    once per process.
     """
-
-    draw = ImageDraw.Draw(image)
-
-    # Common bold fonts on macOS (try in order)
-    font_candidates = [
-        "/System/Library/Fonts/Supplemental/Arial Bold.ttf",
-        "/System/Library/Fonts/Supplemental/Helvetica Bold.ttf",
-        "/System/Library/Fonts/Supplemental/Verdana Bold.ttf",
-        "/System/Library/Fonts/Supplemental/Trebuchet MS Bold.ttf",
-    ]
-
-    text = str(number)
-
-    # Target text box (a bit smaller than the circle diameter)
-    # target_w = radius * 2 * 0.35
-    # target_h = radius * 2 * 0.35
-
-    target_w = radius * 2 * 1.15
-    target_h = radius * 2 * 1.15
-
-    # Load a bold TTF font and size it to fit
-    font = None
-    for path in font_candidates:
+    for path in _bold_font_paths():
+        if not os.path.isfile(path):
+            continue
         try:
-            # Start with a guess; we'll refine below
-            font = ImageFont.truetype(path, size=10)
-            break
+            _load_font(path, 10)
+            return path
         except OSError:
             pass
+    return None
+
+@lru_cache(maxsize=None)
+def _load_font(path, size):
+    return ImageFont.truetype(path, size=size)
+
+@lru_cache(maxsize=None)
+def _fit_font(text, target_w, target_h):
+    """
+    Return the largest bold font (with its text bbox) for which the text fits
+    the target box, or the default font if no bold font is available.
+    """
+
+    path = _bold_font()
 
-    if font is None:
+    if path is None:
         # Fallback (not bold, but at least works)
         font = ImageFont.load_default()
-        # Draw centered with default font
-        bbox = draw.textbbox((0, 0), text, font=font)
-        tw, th = bbox[2] - bbox[0], bbox[3] - bbox[1]
-        draw.text((x - tw / 2, y - th / 2), text, fill=color, font=font)
-        return
+        return font, font.getbbox(text)
 
     # Binary search for best font size that fits target box
-    lo, hi = 1, int(radius * 4)  # generous upper bound
+    lo, hi = 1, int(target_h * 2)  # generous upper bound
     best = lo
-    font_path = font.path  # type: ignore[attr-defined]
 
     while lo <= hi:
         mid = (lo + hi) // 2
-        f = ImageFont.truetype(font_path, size=mid)
-        bbox = draw.textbbox((0, 0), text, font=f)
+        bbox = _load_font(path, mid).getbbox(text)
         tw, th = bbox[2] - bbox[0], bbox[3] - bbox[1]
 
         if tw <= target_w and th <= target_h:
@@ -482,14 +1034,34 @@ def _draw_number(image, x, y, radius, color, number):
         else:
             hi = mid - 1
 
-    font = ImageFont.truetype(font_path, size=best)
+    font = _load_font(path, best)
+    return font, font.getbbox(text)
+
+def _draw_number(image, x, y, radius, color, number):
+    """
+    Draw a bold number centered inside the circle of radius `radius`
+    around (x, y). Text color = `color`.
+    """
+
+    if isinstance(image, _DisplayList):
+        image.items.append(("number", x, y, radius, color, number))
+        return
+
+    # Target text box (a bit smaller than the circle diameter)
+    # target_w = radius * 2 * 0.35
+    # target_h = radius * 2 * 0.35
+
+    target_w = radius * 2 * 1.15
+    target_h = radius * 2 * 1.15
+
+    text = str(number)
+    font, bbox = _fit_font(text, target_w, target_h)
 
     # Center using bbox (accounts for font ascent/descent properly)
-    bbox = draw.textbbox((0, 0), text, font=font)
     tw, th = bbox[2] - bbox[0], bbox[3] - bbox[1]
     ox, oy = bbox[0], bbox[1]
 
-    draw.text(
+    ImageDraw.Draw(image).text(
         (x - tw / 2 - ox, y - th / 2 - oy),
         text,
         fill=color,
@@ -571,3 +1143,8 @@ def _scale_image(source_path, target_path, target_width, target_height, backgrou
     canvas.paste(img, (x, y))
 
     canvas.save(target_path, "PNG")
+
+# Opt-in profiling (see instrument.py); nothing is wrapped unless enabled.
+from . import instrument
+if instrument.ENABLED:
+    instrument.install(globals())
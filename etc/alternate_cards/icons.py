@@ -0,0 +1,46 @@
+import json
+from PIL import Image
+from .draw import _render_display_list
+from .deck import _encode_png, _variant_spec, _write_if_changed
+
+# The app icon is ALTD's icon card (see the "icon" of specs/boxes.json).
+ICON_VARIANT            = "ALTD"
+ICON_SIZES              = [ 20, 29, 40, 50, 57, 58, 60, 72, 76, 80, 87, 100, 114, 120, 144, 152, 167, 180, 1024 ]
+
+def create_icon_image():
+    return _variant_spec(ICON_VARIANT).icon_display_list()
+
+def draw_icon(size, background="white"):
+    """
+    Render the icon card natively at the scale that fits it in a size x size
+    square, centered on the background (as _scale_image lays it out).
+    """
+    icon = create_icon_image()
+    width, height = icon.size
+    card = _render_display_list(icon, scale=min(size / width, size / height))
+    image = Image.new("RGB", (size, size), background)
+    image.paste(card, ((size - card.width) // 2, (size - card.height) // 2))
+    return image
+
+def icon_sizes(directory):
+    """
+    Return a dictionary of the pixel size of each icon file named in the
+    app icon set's Contents.json, or of ICON_SIZES ({size}.png) if it has none.
+    """
+    try:
+        with open(f"{directory}/Contents.json") as f:
+            images = json.load(f)["images"]
+    except FileNotFoundError:
+        return {f"{size}.png": size for size in ICON_SIZES}
+    sizes = {}
+    for image in images:
+        if "filename" in image and "size" in image:
+            points = float(image["size"].split("x")[0])
+            scale = float(image.get("scale", "1x").rstrip("x"))
+            sizes[image["filename"]] = int(round(points * scale))
+    return sizes
+
+def draw_icons(directory):
+    for filename, size in sorted(icon_sizes(directory).items(), key=lambda item: item[1]):
+        # Icons keep full RGB (no palette), as Xcode and the App Store expect.
+        _write_if_changed(f"{directory}/{filename}", _encode_png(draw_icon(size), palette=False))
@@ -0,0 +1,165 @@
+"""
+Opt-in instrumentation of the draw.py primitives.
+
+Set ALTERNATE_CARDS_PROFILE=1 in the environment (build --profile does so)
+before draw.py is imported, and draw.py calls install(), which wraps its
+_draw_*, _render_*, _paint_* and _scale_image functions (and
+_render_display_list) to record, per function:
+
+    calls       number of calls
+    ms          wall time, including nested instrumented calls
+    self ms     wall time, excluding nested instrumented calls
+    pixels      scratch-image pixels allocated (Image.new) while innermost
+    resizes     LANCZOS resizes while innermost
+
+and, per card code (see card()), the same totals for everything drawn for
+that card. Without the environment variable nothing is wrapped or patched,
+so instrumentation costs nothing.
+
+Stats are kept per process; deck.py returns each worker's stats with its
+shard (take()) and merges them (merge()) into the building process's.
+"""
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+ENABLED = bool(os.environ.get("ALTERNATE_CARDS_PROFILE"))
+
+_primitives = {}
+_cards = {}
+_stack = []
+_card = None
+
+def _counters():
+    return {"calls": 0, "ms": 0.0, "self_ms": 0.0, "pixels": 0, "resizes": 0}
+
+def _innermost(name, amount):
+    if _stack:
+        _stack[-1][name] += amount
+    if _card is not None:
+        _cards[_card][name] += amount
+
+def _wrap(name, function):
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        frame = {"child_ms": 0.0, "pixels": 0, "resizes": 0}
+        _stack.append(frame)
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            _stack.pop()
+            if _stack:
+                _stack[-1]["child_ms"] += elapsed
+            counters = _primitives.setdefault(name, _counters())
+            counters["calls"] += 1
+            counters["ms"] += elapsed
+            counters["self_ms"] += elapsed - frame["child_ms"]
+            counters["pixels"] += frame["pixels"]
+            counters["resizes"] += frame["resizes"]
+            if _card is not None:
+                _cards[_card]["calls"] += 1
+    return wrapper
+
+def _instrumented(name):
+    return (name.startswith(("_draw_", "_render_", "_paint_")) or name == "_scale_image")
+
+def install(namespace):
+    """
+    Wrap the instrumented functions in the given module namespace (draw.py's
+    globals()) and count scratch images and LANCZOS resizes.
+    """
+
+    from PIL import Image
+
+    for name, value in list(namespace.items()):
+        if callable(value) and _instrumented(name):
+            namespace[name] = _wrap(name, value)
+
+    new, resize = Image.new, Image.Image.resize
+
+    @wraps(new)
+    def counted_new(mode, size, *args, **kwargs):
+        _innermost("pixels", size[0] * size[1])
+        return new(mode, size, *args, **kwargs)
+
+    @wraps(resize)
+    def counted_resize(self, size, resample=None, *args, **kwargs):
+        if resample == Image.LANCZOS:
+            _innermost("resizes", 1)
+        return resize(self, size, resample, *args, **kwargs)
+
+    Image.new = counted_new
+    Image.Image.resize = counted_resize
+
+@contextmanager
+def _card_context(code):
+    global _card
+    previous, _card = _card, code
+    counters = _cards.setdefault(code, _counters())
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        counters["ms"] += (time.perf_counter() - start) * 1000
+        _card = previous
+
+def card(code):
+    """
+    Return a context manager attributing everything drawn within it to the
+    card code (a no-op when instrumentation is off).
+    """
+    return _card_context(code) if ENABLED else nullcontext()
+
+def take():
+    """
+    Return this process's stats and reset them.
+    """
+    stats = {"primitives": dict(_primitives), "cards": dict(_cards)}
+    _primitives.clear()
+    _cards.clear()
+    return stats
+
+def merge(stats):
+    """
+    Add stats returned by take() (e.g. in a worker process) to this process's.
+    """
+    for group, counters in [(stats["primitives"], _primitives), (stats["cards"], _cards)]:
+        for name, values in group.items():
+            total = counters.setdefault(name, _counters())
+            for key, value in values.items():
+                total[key] += value
+
+def report(file=None, top=20):
+    """
+    Print the stats as tables: every primitive, slowest self time first,
+    then the top cards by time and the totals per variant (card code prefix).
+    """
+
+    file = file or sys.stderr
+
+    print(f"{'primitive':<24} {'calls':>8} {'ms':>10} {'self ms':>10} {'Mpixels':>9} {'resizes':>8}", file=file)
+    for name, c in sorted(_primitives.items(), key=lambda item: -item[1]["self_ms"]):
+        print(f"{name:<24} {c['calls']:>8} {c['ms']:>10.1f} {c['self_ms']:>10.1f} "
+              f"{c['pixels'] / 1e6:>9.2f} {c['resizes']:>8}", file=file)
+
+    variants = {}
+    for code, c in _cards.items():
+        total = variants.setdefault(code.split("_")[0], _counters())
+        for key, value in c.items():
+            total[key] += value
+
+    for title, group, limit in [("variant", variants, None), ("card", _cards, top)]:
+        print(f"\n{title:<24} {'calls':>8} {'ms':>10} {'Mpixels':>9} {'resizes':>8}", file=file)
+        for name, c in sorted(group.items(), key=lambda item: -item[1]["ms"])[:limit]:
+            print(f"{name:<24} {c['calls']:>8} {c['ms']:>10.1f} {c['pixels'] / 1e6:>9.2f} {c['resizes']:>8}", file=file)
+
+def write_json(path):
+    with open(path, "w") as f:
+        json.dump({"primitives": _primitives, "cards": _cards}, f, indent=1, sort_keys=True)
+        f.write("\n")
@@ -0,0 +1,120 @@
+"""
+Layered mask export, for tinting cards at runtime in the app instead of
+bundling every color of a deck.
+
+For a variant whose cards are drawn in one of its COLORS (ALTC and ALTD),
+export_layers() writes, for each combination of the other attributes
+(number, shape and filling), grayscale coverage layers as imagesets named
+{VARIANT}_{NUMBER}_{SHAPE}_{FILLING}_{ROLE}, with only the roles the figure
+uses:
+
+    OUTER   the figure in its color (the border, or all of a solid figure)
+    FILL    the interior of a hollow figure, in the card background color
+    TINT    the interior of a striped figure, in its color's stripe tint
+
+plus {VARIANT}_BASE, the card without figures (in color), and a recipe,
+{VARIANT}_LAYERS.dataset/{VARIANT}_LAYERS.json:
+
+    {"colors": [...], "tint": 0.6, "background": "white", "base": "ALTD_BASE",
+     "scales": [1, 2, 3], "layers": {"ALTD_0_OVAL_HOLLOW": {"fill": ..., "outer": ...}, ...},
+     "cards": {"ALTD_RQH1": {"layers": "ALTD_0_OVAL_HOLLOW", "color": "#9C3327"}, ...}}
+
+A card is then, per pixel, with each layer's coverage c in [0, 1]:
+
+    base * (1 - sum(c)) + color * c_outer + background * c_fill + tint(color) * c_tint
+
+where tint(color) blends the color toward white by the recipe's tint, as
+draw._lighten_color does. The layers come from masks.render_masks(), but
+as 8-bit coverage they lose LANCZOS's ringing, so composed cards differ
+from rendered ones at some antialiased edges. A new palette is just a new
+colors list, and a deck's layers are smaller than its cards.
+"""
+
+import json
+import os
+import numpy as np
+from PIL import Image
+from .deck import SCALES, _encode_png, _variant_spec, _write_if_changed
+from .deck import catalog_imageset, image_filename, imageset_contents
+from .draw import _DisplayList, _lighten_color, _paint_item, _render_display_list, _template_length
+from .atlas import dataset_contents
+from . import masks
+
+LAYERS_SUFFIX = "_LAYERS"
+
+def _roles(colors, color, background, tint):
+    roles = []
+    for slot_color in colors:
+        if slot_color == color:
+            roles.append("outer")
+        elif slot_color == _lighten_color(color, tint):
+            roles.append("tint")
+        elif slot_color == background:
+            roles.append("fill")
+        else:
+            raise ValueError(f"figure color {slot_color} is not the card's color, its tint or the background")
+    return roles
+
+def _layer_images(display_list, color, tint, scale, aa=4):
+    """
+    Return a dictionary of the coverage layers (L images) of the figures of
+    the display list at scale, by role, tint being the variant's stripe tint.
+    """
+    count = _template_length(display_list)
+    geometry, colors = masks.split_colors(display_list.items[count:])
+    width, height = display_list.size
+    canvas = (width * scale, height * scale)
+    coverage = masks.render_masks(geometry, len(colors), canvas, (0, 0) + canvas, aa, scale, _paint_item)
+    layers = {}
+    for role, mask in zip(_roles(colors, color, display_list.background, tint), coverage):
+        layers[role] = layers.get(role, 0) + mask
+    return {role: Image.fromarray(np.clip(np.rint(mask * 255), 0, 255).astype(np.uint8), "L")
+            for role, mask in layers.items()}
+
+def export_layers(directory, variant, scales=SCALES):
+    """
+    Write the coverage layers, base image and recipe of the variant (a
+    VARIANTS name such as "ALTD") into the asset catalog directory and
+    return the number of files written.
+    """
+
+    module = _variant_spec(variant)
+    written = 0
+    sets = {}
+    cards = {}
+    base = None
+
+    def write_imageset(name, images):
+        imageset = catalog_imageset(directory, name)
+        count = 0
+        for scale, image in sorted(images.items()):
+            count += _write_if_changed(f"{imageset}/{image_filename(name, scale)}", _encode_png(image))
+        return count + _write_if_changed(f"{imageset}/Contents.json", imageset_contents(name, images).encode())
+
+    for code, attributes in module.cards():
+        name = "_".join([variant] + [str(value).upper() for key, value in attributes.items() if key != "color"])
+        cards[code] = {"layers": name, "color": attributes["color"]}
+        if name in sets:
+            continue
+        display_list = module.card_display_list(**attributes)
+        if base is None:
+            base = _DisplayList(*display_list.size, display_list.background)
+            base.items = display_list.items[:_template_length(display_list)]
+            written += write_imageset(f"{variant}_BASE", {scale: _render_display_list(base, scale=scale) for scale in scales})
+        by_role = {}
+        for scale in scales:
+            for role, image in _layer_images(display_list, attributes["color"], module.tint, scale).items():
+                by_role.setdefault(role, {})[scale] = image
+        sets[name] = {}
+        for role, images in sorted(by_role.items()):
+            sets[name][role] = f"{name}_{role.upper()}"
+            written += write_imageset(sets[name][role], images)
+
+    recipe = {"colors": list(module.COLORS), "tint": module.tint, "background": base.background,
+              "base": f"{variant}_BASE", "scales": sorted(scales), "layers": sets, "cards": cards}
+    name = f"{variant}{LAYERS_SUFFIX}"
+    dataset = f"{directory}/{name}.dataset"
+    os.makedirs(dataset, exist_ok=True)
+    written += _write_if_changed(f"{dataset}/{name}.json", (json.dumps(recipe, indent=1) + "\n").encode())
+    written += _write_if_changed(f"{dataset}/Contents.json", dataset_contents(f"{name}.json").encode())
+    return written
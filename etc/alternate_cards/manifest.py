@@ -0,0 +1,130 @@
+"""
+Content-hash manifest for incremental deck builds.
+
+For each card code the manifest records two SHA-256 hashes:
+
+    input:  the render parameters, i.e. the card's attributes, draw.py's
+            data globals (constants like BORDER_MODE, but not the cache and
+            store settings in _NOT_INPUTS), and the variant's spec file and
+            the source of draw.py, coverage.py, masks.py, spec.py and
+            deck.py (which encodes the PNGs).
+    output: the encoded PNG bytes of all of the card's scales.
+
+A card whose input hash is unchanged, and whose file on disk still hashes to
+the recorded output, is not rendered again. A rendered card whose bytes are
+identical to the file on disk is not written again (see deck.write_deck), so
+tweaking one constant only touches the imagesets whose pixels changed.
+"""
+
+import hashlib
+import json
+import os
+
+MANIFEST_NAME = ".alternate_cards_manifest.json"
+MANIFEST_VERSION = 1
+
+_DATA_TYPES = (str, int, float, bool, type(None), list, tuple, dict)
+
+def _hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+# Data globals that do not affect the pixels, only how they are computed
+# (caches, the sprite store, stamping), so changing them rebuilds nothing.
+_NOT_INPUTS = {"SPRITE_CACHE_SIZE", "TEMPLATE_CACHE_SIZE", "STORE", "STAMPS"}
+
+def _data_globals(module):
+    return {name: repr(value) for name, value in sorted(vars(module).items())
+            if not name.startswith("_") and name not in _NOT_INPUTS and isinstance(value, _DATA_TYPES)}
+
+def render_inputs(module):
+    """
+    Return the hash of everything a variant's renders depend on other than
+    the per-card attributes.
+    """
+    from . import draw, spec
+    directory = os.path.dirname(draw.__file__)
+    sources = [module.path, draw.__file__, os.path.join(directory, "coverage.py"),
+               os.path.join(directory, "masks.py"), os.path.join(directory, "deck.py"), spec.__file__]
+    digest = hashlib.sha256()
+    for source in sources:
+        with open(source, "rb") as f:
+            digest.update(_hash(f.read()).encode())
+    digest.update(json.dumps(_data_globals(draw)).encode())
+    return digest.hexdigest()
+
+def card_input(inputs, attributes):
+    """
+    Return the input hash of one card given render_inputs() of its variant.
+    """
+    return _hash(json.dumps([inputs, repr(sorted(attributes.items()))]).encode())
+
+def _output_hash(pngs):
+    return _hash("".join(_hash(png) for png in pngs).encode())
+
+def files_hash(files):
+    pngs = []
+    for file in files:
+        try:
+            with open(file, "rb") as f:
+                pngs.append(f.read())
+        except FileNotFoundError:
+            return None
+    return _output_hash(pngs)
+
+class Manifest:
+
+    def __init__(self, path):
+        self.path = path
+        self.cards = {}
+        self._changed = False
+        try:
+            with open(path) as f:
+                manifest = json.load(f)
+            if manifest.get("version") == MANIFEST_VERSION:
+                self.cards = manifest.get("cards", {})
+        except (FileNotFoundError, ValueError):
+            pass
+
+    def unchanged(self, code, input_hash, files):
+        """
+        True if the code was last built from the same inputs and its files
+        (in scale order) are still the ones that build wrote.
+        """
+        entry = self.cards.get(code)
+        return (entry is not None and entry["input"] == input_hash
+                and files_hash(files) == entry["output"])
+
+    def record(self, code, input_hash, images):
+        entry = {"input": input_hash, "output": _output_hash(png for _, png in sorted(images.items()))}
+        if self.cards.get(code) != entry:
+            self.cards[code] = entry
+            self._changed = True
+
+    def codes(self):
+        return list(self.cards)
+
+    def adopt(self, other, code):
+        """
+        Record the code as other (another Manifest) does, e.g. when its files
+        are copied from other's directory; if other has no entry for it, the
+        code is recorded with no inputs, so it is built again next time.
+        """
+        entry = other.cards.get(code, {"input": None, "output": None})
+        if self.cards.get(code) != entry:
+            self.cards[code] = entry
+            self._changed = True
+
+    def forget(self, code):
+        if self.cards.pop(code, None) is not None:
+            self._changed = True
+
+    def save(self):
+        if not self._changed:
+            return
+        # Written to a temporary file and renamed, so it is never half written.
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w") as f:
+            json.dump({"version": MANIFEST_VERSION, "cards": self.cards}, f, indent=1, sort_keys=True)
+            f.write("\n")
+        os.replace(temporary, self.path)
+        self._changed = False
@@ -0,0 +1,92 @@
+"""
+Coverage masks for figure stamps: rasterize a figure's geometry once and
+derive it in every color by compositing.
+
+The hollow, stripe and solid fillings of a shape in each of the three colors
+are nine stamps (see draw._stamp) but only three geometries: hollow and
+stripe differ in border thickness, and the color only changes what is
+painted, not where. split_colors() separates a figure's display list items
+into their geometry (the items with each distinct color replaced by its
+slot number, in order of first use) and the colors by slot.
+
+render_masks() paints the geometry once at aa times the output size as an
+index map, each pixel holding the slot last painted there, and downsamples
+one float coverage mask per slot with LANCZOS. composite() then gives the
+stamp for any colors on any background:
+
+    background * (1 - sum(masks)) + sum(mask * color)
+
+LANCZOS is linear and the float masks keep its lobes, so on a uniform
+background this is the painted figure downsampled, except that Pillow
+resizes RGB in two 8-bit passes and clips the lobes between them, so a few
+antialiased edge pixels (mostly on diagonals) differ slightly from painting
+each stamp. The stripe tint (draw._lighten_color) is just another color.
+"""
+
+import numpy as np
+from PIL import Image, ImageColor, ImageDraw
+
+# Index of the color fields in display list items, by shape.
+_COLOR_FIELDS = {
+    "circle": (4, 6),
+    "square": (4, 6),
+    "triangle": (4, 6),
+    "rectangle": (5, 7),
+    "diamond": (5, 7),
+}
+
+def supported(items):
+    """
+    True if the items can be rendered as masks; numbers are text, which
+    Pillow antialiases itself, so cannot be painted into an index map.
+    """
+    return all(item[0] in _COLOR_FIELDS for item in items)
+
+def split_colors(items):
+    """
+    Return the geometry of the display list items (the items with their
+    colors replaced by slot numbers from 1) and the list of colors by slot.
+    """
+    colors = []
+    geometry = []
+    for item in items:
+        item = list(item)
+        for field in _COLOR_FIELDS[item[0]]:
+            color = item[field]
+            # An unused border color is None or "" and stays so.
+            if color:
+                if color not in colors:
+                    colors.append(color)
+                item[field] = colors.index(color) + 1
+        geometry.append(tuple(item))
+    return tuple(geometry), colors
+
+def render_masks(geometry, slots, canvas, crop, aa, scale, paint_item):
+    """
+    Paint the geometry (items relative to a canvas of the given output size)
+    at aa times that size and return a float32 array of shape (slots,
+    height, width) holding each slot's coverage of the crop (left, top,
+    right, bottom) of the downsampled canvas, 1.0 where fully covered.
+    """
+
+    width, height = canvas
+    index = Image.new("L", (width * aa, height * aa), 0)
+    d = ImageDraw.Draw(index)
+    for item in geometry:
+        paint_item(index, d, item, aa * scale)
+
+    masks = []
+    for slot in range(1, slots + 1):
+        mask = index.point([255 if value == slot else 0 for value in range(256)]).convert("F")
+        masks.append(np.asarray(mask.resize(canvas, resample=Image.LANCZOS).crop(crop)))
+    return np.stack(masks) / np.float32(255)
+
+def composite(masks, colors, background):
+    """
+    Return the RGB image of the colors (by slot) painted with the coverage
+    masks from render_masks() over the background image (the same size).
+    """
+    rgb = np.array([ImageColor.getrgb(color)[:3] for color in colors], dtype=np.float32)
+    result = np.asarray(background, dtype=np.float32) * (1 - masks.sum(axis=0))[..., None]
+    result += np.tensordot(masks, rgb, axes=(0, 0))
+    return Image.fromarray(np.clip(np.rint(result), 0, 255).astype(np.uint8), "RGB")
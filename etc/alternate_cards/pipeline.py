@@ -0,0 +1,183 @@
+"""
+Pipelined render -> encode -> write deck builder for a single process.
+
+Only build --jobs 1 builds its decks with it: with more jobs, worker
+processes render and encode shards of each deck in parallel instead (see
+deck.build_deck).
+
+build_deck_pipelined() runs the three stages of a deck build on separate
+threads joined by bounded queues, so PNG encoding (zlib, which releases the
+GIL) and file writes overlap with rasterizing the next card:
+
+    render   (1 thread)   card -> image, for each scale, through a plan.py Plan
+    encode   (ENCODERS)   image -> PNG bytes (deck._encode_png)
+    write    (1 thread)   PNG bytes -> imageset file, plus Contents.json
+
+At most QUEUE_SIZE items wait between two stages, so a slow stage holds
+back the ones before it rather than letting rendered images pile up in
+memory. Each stage's busy time, and the time it spent blocked waiting for
+input or for room downstream, is returned so the bottleneck is visible (the
+busiest stage; the others spend their time blocked). Encode times are
+summed over the encoder threads.
+
+The files written and the results returned are the same as build_deck()
+followed by write_deck().
+"""
+
+import queue
+import threading
+import time
+from .deck import SCALES, _encode_png, _variant_spec, _write_if_changed
+from .deck import catalog_imageset, image_filename, imageset_contents
+from .plan import compile_plan
+
+QUEUE_SIZE = 4
+ENCODERS = 2
+
+_DONE = object()
+
+class _Stage:
+
+    def __init__(self, name):
+        self.name = name
+        self.items = 0
+        self.busy = 0.0
+        self.waiting_input = 0.0
+        self.waiting_output = 0.0
+
+    def stats(self):
+        return dict(items=self.items, busy=self.busy, waiting_input=self.waiting_input, waiting_output=self.waiting_output)
+
+    def add(self, other):
+        self.items += other.items
+        self.busy += other.busy
+        self.waiting_input += other.waiting_input
+        self.waiting_output += other.waiting_output
+
+class _Aborted(Exception):
+    pass
+
+class _Pipeline:
+
+    def __init__(self):
+        self.abort = threading.Event()
+        self.error = None
+
+    def get(self, q, stage):
+        start = time.perf_counter()
+        while True:
+            if self.abort.is_set():
+                raise _Aborted()
+            try:
+                item = q.get(timeout=0.1)
+                break
+            except queue.Empty:
+                pass
+        stage.waiting_input += time.perf_counter() - start
+        return item
+
+    def put(self, q, item, stage):
+        start = time.perf_counter()
+        while True:
+            if self.abort.is_set():
+                raise _Aborted()
+            try:
+                q.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                pass
+        stage.waiting_output += time.perf_counter() - start
+
+    def run(self, target, *args):
+        def runner():
+            try:
+                target(*args)
+            except _Aborted:
+                pass
+            except BaseException as error:
+                self.error = self.error or error
+                self.abort.set()
+        thread = threading.Thread(target=runner, daemon=True)
+        thread.start()
+        return thread
+
+def build_deck_pipelined(variant, directory, skip=(), scales=SCALES, encoders=ENCODERS, queue_size=QUEUE_SIZE):
+    """
+    Render, encode and write every card of the named variant, except
+    those whose codes are in skip, into the asset catalog directory; return
+    the (code, images) results in deck order (as build_deck does), the
+    number of files written and a dictionary of stage stats by stage name.
+    """
+
+    module = _variant_spec(variant)
+    cards = [(code, attributes) for code, attributes in module.cards() if code not in skip]
+    order = {code: index for index, (code, _) in enumerate(cards)}
+    plan = compile_plan([variant], scales, skip)
+
+    pipeline = _Pipeline()
+    rendered = queue.Queue(maxsize=queue_size)
+    encoded = queue.Queue(maxsize=queue_size)
+    render_stage, write_stage = _Stage("render"), _Stage("write")
+    encode_stages = [_Stage("encode") for _ in range(encoders)]
+    results = {}
+    written = [0]
+
+    def render():
+        rendering = plan.render()
+        while True:
+            start = time.perf_counter()
+            card = next(rendering, None)
+            render_stage.busy += time.perf_counter() - start
+            if card is None:
+                break
+            _, code, images = card
+            for scale, image in images.items():
+                render_stage.items += 1
+                pipeline.put(rendered, (code, scale, image), render_stage)
+        for _ in range(encoders):
+            pipeline.put(rendered, _DONE, render_stage)
+
+    def encode(encode_stage):
+        while True:
+            item = pipeline.get(rendered, encode_stage)
+            if item is _DONE:
+                pipeline.put(encoded, _DONE, encode_stage)
+                return
+            code, scale, image = item
+            start = time.perf_counter()
+            png = _encode_png(image)
+            encode_stage.busy += time.perf_counter() - start
+            encode_stage.items += 1
+            pipeline.put(encoded, (code, scale, png), encode_stage)
+
+    def write():
+        remaining = encoders
+        while remaining:
+            item = pipeline.get(encoded, write_stage)
+            if item is _DONE:
+                remaining -= 1
+                continue
+            code, scale, png = item
+            start = time.perf_counter()
+            imageset = catalog_imageset(directory, code)
+            written[0] += _write_if_changed(f"{imageset}/{image_filename(code, scale)}", png)
+            images = results.setdefault(code, {})
+            images[scale] = png
+            if len(images) == len(scales):
+                written[0] += _write_if_changed(f"{imageset}/Contents.json", imageset_contents(code, images).encode())
+            write_stage.busy += time.perf_counter() - start
+            write_stage.items += 1
+
+    threads = [pipeline.run(render)] + [pipeline.run(encode, stage) for stage in encode_stages] + [pipeline.run(write)]
+    for thread in threads:
+        thread.join()
+    if pipeline.error is not None:
+        raise pipeline.error
+
+    encode_stage = _Stage("encode")
+    for stage in encode_stages:
+        encode_stage.add(stage)
+
+    results = sorted(results.items(), key=lambda item: order[item[0]])
+    stats = {stage.name: stage.stats() for stage in [render_stage, encode_stage, write_stage]}
+    return results, written[0], stats
@@ -0,0 +1,116 @@
+"""
+Render plans: the cards of one or more variants split into their shared
+parts, and rendered by rasterizing each shared part once.
+
+compile_plan() builds the display list of every card of the given variants
+(modules or specs; see spec.py) and splits each into its template (the
+leading full-card rectangles, see draw._template_length) and its figures
+(draw._figure_groups). A figure is keyed by its items relative to its box,
+so the same figure at another position, on another card or in another
+variant is one entry, and its geometry by masks.split_colors(), so the same
+shape in another color is one too. This needs no pixels; summary() gives
+the counts, e.g. ALTD's 81 cards draw 162 figure instances of 27 figures of
+9 geometries on 1 template.
+
+Plan.render() then renders the cards from the plan's entries: each card at
+each scale is its downsampled template (draw._cached_template) with a stamp
+(draw._stamp) pasted for each of its figures, by draw._render_stamps, which
+the profile (see instrument.py) times with the stamps it rasterizes. The plan keeps every stamp it
+rasterizes, by its key, for as long as it lives, so each distinct stamp of
+the plan is rasterized once however many cards and variants share it
+(stamps come from the sprite cache, and the sprite store, when they are in
+it). Cards that cannot be stamped (e.g. with the numpy backend) are
+rendered as draw._render_display_list does. The pixels are the same.
+
+build renders each deck through a plan: deck.build_deck's worker shards and
+the --jobs 1 pipeline (pipeline.py) each render their cards with one.
+"""
+
+from . import draw, instrument
+from .deck import SCALES, _encode_png, _variant_spec
+
+class Plan:
+
+    def __init__(self, scales=SCALES, aa=4):
+        self.scales = list(scales)
+        self.aa = aa
+        self.decks = {}
+        self.templates = {}
+        self.figures = {}
+        self.geometries = {}
+        self.instances = 0
+        self.stamps = {}
+
+    def add(self, variant, code, display_list):
+        self.decks.setdefault(variant, []).append((code, display_list))
+        count = draw._template_length(display_list)
+        template = (display_list.size, display_list.background, tuple(display_list.items[:count]))
+        self.templates[template] = self.templates.get(template, 0) + 1
+        for items in draw._figure_groups(display_list.items[count:], 2 * draw.STAMP_MARGIN / min(self.scales)):
+            boxes = [draw._item_bounds(item) for item in items]
+            left, top = min(box[0] for box in boxes), min(box[1] for box in boxes)
+            figure = tuple(draw._translate_item(item, -left, -top) for item in items)
+            self.figures[figure] = self.figures.get(figure, 0) + 1
+            self.instances += 1
+            masks = draw._stamp_masks()
+            if masks is not None and masks.supported(figure):
+                geometry = masks.split_colors(figure)[0]
+                self.geometries[geometry] = self.geometries.get(geometry, 0) + 1
+
+    def summary(self):
+        """
+        Return a dictionary of the number of cards, templates, figure
+        instances, distinct figures and distinct figure geometries, and of
+        the stamps rasterized so far.
+        """
+        return dict(cards=sum(len(cards) for cards in self.decks.values()), templates=len(self.templates),
+                    instances=self.instances, figures=len(self.figures), geometries=len(self.geometries),
+                    stamps=len(self.stamps))
+
+    def render_images(self, display_list):
+        """
+        Return a dictionary of the images of a card at the plan's scales,
+        rasterizing only the stamps the plan does not have yet.
+        """
+        images = {}
+        for scale in self.scales:
+            image = draw._render_stamps(display_list, self.aa, scale, self.stamps)
+            if image is None:
+                image = draw._render_display_list(display_list, self.aa, scale=scale)
+            images[scale] = image
+        return images
+
+    def render(self):
+        """
+        Yield (variant, code, images) for every card of the plan, in the
+        order they were added, images being a dictionary by scale.
+        """
+        for variant, cards in self.decks.items():
+            for code, display_list in cards:
+                with instrument.card(code):
+                    images = self.render_images(display_list)
+                yield variant, code, images
+
+def compile_plan(variants, scales=SCALES, skip=()):
+    """
+    Return the Plan of every card of the variants (VARIANTS names such as
+    "ALTD") at the given scales, except those whose codes are in skip.
+    """
+    plan = Plan(scales)
+    for variant in variants:
+        module = _variant_spec(variant)
+        for code, attributes in module.cards():
+            if code not in skip:
+                plan.add(variant, code, module.card_display_list(**attributes))
+    return plan
+
+def render_plan(plan):
+    """
+    Render every card of the plan and return a dictionary of the (code,
+    images) results of each variant, in deck order, images being PNG bytes
+    by scale (see deck.build_deck).
+    """
+    results = {}
+    for variant, code, images in plan.render():
+        results.setdefault(variant, []).append((code, {scale: _encode_png(image) for scale, image in images.items()}))
+    return results
@@ -0,0 +1,146 @@
+"""
+Palette-LUT recoloring of rendered decks, for themes (e.g. dark backgrounds
+or other COLORS triples) without rendering the deck again.
+
+A mapping gives the new color of each flat color of a deck (figure colors,
+background, border), e.g. {"#9C3327": "#E57373", "white": "#202020"}; each
+mapped color's stripe tint (draw._lighten_color) is mapped to the new
+color's tint, and the deck's other flat colors (see deck_colors()), white
+and black are kept as they are. These are the anchors. Every other color in
+a card is an antialiased blend, so each distinct color is located on the
+nearest segment between two anchors (extended a little at both ends for
+LANCZOS ringing; see OVERSHOOT),
+
+    color = a + t * (b - a) + residual
+
+and replaced by the same blend of the new colors, m(a) + t * (m(b) - m(a)),
+plus the residual (so the identity mapping changes nothing). The result for
+each distinct color is computed once into a lookup table: for a palette PNG
+(most cards; see deck.py) only its palette is remapped, for an RGB one its
+pixels are remapped through the table with numpy.
+
+recolor_deck() reads a variant's cards from an asset catalog and writes the
+recolored deck under a new code prefix, e.g. ALTD_RQH1 -> ALTDK_RQH1.
+"""
+
+import numpy as np
+from PIL import Image, ImageColor
+from .deck import SCALES, _encode_png, _variant_spec, _write_if_changed
+from .deck import catalog_files, catalog_imageset, image_filename, imageset_contents
+from .draw import _lighten_color
+
+# Blend of a color toward white used for the stripe tints (see draw.py).
+TINT = 0.6
+
+# Flat colors kept unchanged unless mapped.
+KEEP = ["white", "black"]
+
+# How far past either end of a blend a color may lie and still be that blend:
+# LANCZOS rings, so next to an edge a color overshoots the flat one by up to
+# about a tenth of the step, and would otherwise be taken for a blend with
+# some third color (e.g. a dark ring as a blend toward black).
+OVERSHOOT = 0.2
+
+def _rgb(color):
+    return ImageColor.getrgb(color)[:3]
+
+def _hex(rgb):
+    return "#{:02X}{:02X}{:02X}".format(*rgb)
+
+def deck_colors(module):
+    """
+    Return the set of flat colors (names or hex) the cards of a variant
+    module are drawn in: their backgrounds and the colors of their display
+    list items, stripe tints included.
+    """
+    from .masks import _COLOR_FIELDS
+    colors = set()
+    for _, attributes in module.cards():
+        display_list = module.card_display_list(**attributes)
+        colors.add(display_list.background)
+        for item in display_list.items:
+            fields = _COLOR_FIELDS.get(item[0], (4,))
+            colors.update(item[field] for field in fields if item[field])
+    return colors
+
+def anchors(mapping, tint=TINT, keep=()):
+    """
+    Return the (source, destination) RGB anchor pairs for a mapping of colors
+    (names or hex), adding, if tint is not None, the tints of the mapped
+    colors, then the unmapped KEEP colors and colors in keep (e.g. the
+    deck_colors() of the variant), unchanged.
+    """
+    pairs = {_rgb(source): _rgb(destination) for source, destination in mapping.items()}
+    if tint is not None:
+        for source, destination in list(pairs.items()):
+            tinted = _rgb(_lighten_color(_hex(source), tint))
+            pairs.setdefault(tinted, _rgb(_lighten_color(_hex(destination), tint)))
+    for color in list(KEEP) + sorted(keep):
+        pairs.setdefault(_rgb(color), _rgb(color))
+    return list(pairs.items())
+
+def color_table(colors, pairs):
+    """
+    Return the recolored array of the given (n, 3) array of RGB colors, for
+    the anchor pairs from anchors().
+    """
+
+    colors = np.asarray(colors, dtype=np.float64).reshape(-1, 3)
+    sources = np.array([source for source, _ in pairs], dtype=np.float64)
+    destinations = np.array([destination for _, destination in pairs], dtype=np.float64)
+    i, j = np.triu_indices(len(pairs))
+    a, b = sources[i], sources[j]
+    d = b - a
+
+    # Nearest point on each anchor segment (a single anchor when i == j),
+    # extended by OVERSHOOT at both ends.
+    offset = colors[:, None, :] - a[None, :, :]
+    length = np.maximum((d * d).sum(axis=1), 1e-9)
+    t = np.clip((offset * d[None, :, :]).sum(axis=2) / length, -OVERSHOOT, 1.0 + OVERSHOOT)
+    residual = offset - t[..., None] * d[None, :, :]
+    nearest = (residual * residual).sum(axis=2).argmin(axis=1)
+
+    rows = np.arange(len(colors))
+    t, residual = t[rows, nearest], residual[rows, nearest]
+    ma, mb = destinations[i[nearest]], destinations[j[nearest]]
+    recolored = ma + t[:, None] * (mb - ma) + residual
+    return np.clip(np.rint(recolored), 0, 255).astype(np.uint8)
+
+def recolor_image(image, pairs):
+    """
+    Return the image recolored for the anchor pairs from anchors(): a
+    palette image with its palette remapped, otherwise an RGB image.
+    """
+    if image.mode == "P" and "transparency" not in image.info:
+        palette = np.array(image.getpalette("RGB"), dtype=np.uint8).reshape(-1, 3)
+        image = image.copy()
+        image.putpalette(color_table(palette, pairs).tobytes())
+        return image
+    pixels = np.asarray(image.convert("RGB"))
+    keys = (pixels[..., 0].astype(np.uint32) << 16) | (pixels[..., 1].astype(np.uint32) << 8) | pixels[..., 2]
+    unique, inverse = np.unique(keys.ravel(), return_inverse=True)
+    colors = np.stack([(unique >> 16) & 255, (unique >> 8) & 255, unique & 255], axis=1)
+    return Image.fromarray(color_table(colors, pairs)[inverse].reshape(pixels.shape), "RGB")
+
+def recolor_deck(directory, variant, prefix, mapping, scales=SCALES, out=None, tint=TINT):
+    """
+    Recolor the images of every card of the variant (a VARIANTS name such as
+    "ALTD") in the asset catalog directory, at the given scales, and write
+    them into the asset catalog out (default: the same directory) with the
+    variant prefix of their codes replaced by prefix; return the number of
+    files written.
+    """
+
+    out = out or directory
+    module = _variant_spec(variant)
+    pairs = anchors(mapping, tint, deck_colors(module))
+    written = 0
+    for code, _ in module.cards():
+        new_code = prefix + code[len(variant):] if code.startswith(variant) else f"{prefix}_{code}"
+        imageset = catalog_imageset(out, new_code)
+        for scale, file in zip(sorted(scales), catalog_files(directory, code, scales)):
+            with Image.open(file) as image:
+                png = _encode_png(recolor_image(image, pairs))
+            written += _write_if_changed(f"{imageset}/{image_filename(new_code, scale)}", png)
+        written += _write_if_changed(f"{imageset}/Contents.json", imageset_contents(new_code, scales).encode())
+    return written
@@ -0,0 +1,200 @@
+"""
+Declarative card variant specs.
+
+A spec (JSON, in specs/) describes a card variant as data, e.g. (abridged
+from specs/boxes.json):
+
+    {
+      "prefix": "ALTD_",
+      "card": {"width": 200, "height": 240, "background": "white",
+               "items": [{"draw": "rectangle", "width": 200, "height": 240, "color": "white",
+                          "border": 1, "border_color": "white"}]},
+      "axes": [{"name": "number", "values": [0, 1, 2], "codes": ["1", "2", "3"]},
+               {"name": "color", "values": ["#9C3327", "#2D34A1", "#3D713D"], "codes": ["R", "P", "G"]},
+               ...],
+      "order": ["color", "shape", "filling", "number"],
+      "code": ["color", "shape", "filling", "number"],
+      "variables": {"filling": {"hollow": {"fill": "{background}", "border": 10, "border_color": "{color}"},
+                                ...}},
+      "figures": {"axis": "shape",
+                  "items": {"oval": [{"draw": "rectangle", "width": 150, "height": 51,
+                                      "color": "{fill}", "border": "{border}",
+                                      "border_color": "{border_color}", "rounding": 0.2}],
+                            ...}},
+      "layout": {"axes": ["number"], "offsets": {"0": [[0, 0]], "1": [[0, -30], [0, 30]], ...}},
+      "extras": {"DUMMY": []},
+      "icon": [{"attributes": {"shape": "oval", "filling": "solid", ...}, "offset": [0, 0]}, ...]
+    }
+
+axes are the card attributes, in the order of the attributes dictionary;
+order is the deck order (outermost loop first, default the axes order) and
+code the order of the axes' codes (default index digits) after prefix in a
+card's code.
+
+Each card draws the card items, then its figure at every offset of its
+layout: the figures items of its value on the figures axis (or, without an
+axis, the same items for every card), at the offsets of the layout keyed by
+its values on the layout axes, joined by commas (e.g. "2,0" for ALTNC's
+number and column); without a layout, once at the center.
+
+An item is the keyword arguments of a draw.py primitive, named by "draw"
+(_draw_rectangle, _draw_diamond, _draw_circle, _draw_square, _draw_triangle
+or _draw_number), with x and y (default 0) relative to the card center plus
+the offset, and drawn only if the card's attributes have one of the values
+listed in its "when" (e.g. {"filling": ["hollow", "stripe"]}), if any. A
+string value "{name}" is a variable: a card attribute, one of the spec's
+"constants", a variable of one of the card's attribute values, "background"
+(the card's) or "tint" (the color variable lightened by
+draw._lighten_color with the spec's "tint", default 0.6). Variables may
+refer to other variables, and the card's background may be one (e.g.
+"{bg}", for variants whose background is an attribute).
+
+extras are other images of the variant, by name (e.g. the blank DUMMY card
+used by FoundSetsView), and icon is the variant's app icon (see icons.py),
+each a list of figures, by their attributes and offset, drawn on the card.
+
+load() compiles a spec into a Spec, which has the cards(),
+card_display_list() and extras() of the variant; deck._variant_spec loads
+the spec file a VARIANTS entry names, for deck.py, pipeline.py, atlas.py,
+layers.py and the rest.
+"""
+
+import itertools
+import json
+import os
+from . import draw
+
+SPEC_DIRECTORY = os.path.join(os.path.dirname(__file__), "specs")
+
+class Spec:
+
+    def __init__(self, spec, path=None):
+        self.spec = spec
+        self.path = path
+        self.prefix = spec.get("prefix", "")
+        card = spec["card"]
+        self.size = (card["width"], card["height"])
+        self.background = card.get("background", "white")
+        self.tint = spec.get("tint", 0.6)
+        self.axes = [(axis["name"], list(axis["values"]), [str(code) for code in axis.get("codes", range(len(axis["values"])))])
+                     for axis in spec["axes"]]
+        names = [name for name, _, _ in self.axes]
+        # The values of each axis by its plural, upper-case name, e.g. COLORS.
+        for name, values, _ in self.axes:
+            setattr(self, f"{name.upper()}S", values)
+        self.order = spec.get("order", names)
+        self.code_order = spec.get("code", names)
+        for key in ["order", "code"]:
+            if sorted(spec.get(key, names)) != sorted(names):
+                raise ValueError(f"spec {key} {spec[key]} is not an ordering of the axes {names}")
+
+    def values(self, name):
+        return next(values for axis, values, _ in self.axes if axis == name)
+
+    def cards(self):
+        """
+        Yield the (code, attributes) of every card in deck order.
+        """
+        axes = {name: (values, codes) for name, values, codes in self.axes}
+        for indices in itertools.product(*(range(len(axes[name][0])) for name in self.order)):
+            index = dict(zip(self.order, indices))
+            code = self.prefix + "".join(axes[name][1][index[name]] for name in self.code_order)
+            yield code, {name: values[index[name]] for name, values, _ in self.axes}
+
+    def _variables(self, attributes):
+        variables = dict(self.spec.get("constants", {}), **attributes)
+        for name, value in attributes.items():
+            variables.update(self.spec.get("variables", {}).get(name, {}).get(str(value), {}))
+        variables["background"] = self._resolve(self.background, variables)
+        if "color" in variables:
+            variables["tint"] = draw._lighten_color(self._resolve(variables["color"], variables), self.tint)
+        return variables
+
+    def _resolve(self, value, variables):
+        seen = set()
+        while isinstance(value, str) and value.startswith("{") and value.endswith("}"):
+            if value in seen:
+                raise ValueError(f"spec variable {value} refers to itself")
+            seen.add(value)
+            value = variables[value[1:-1]]
+        return value
+
+    def _draw(self, image, item, variables, attributes, offset=(0, 0)):
+        for name, values in item.get("when", {}).items():
+            if attributes.get(name) not in values:
+                return
+        arguments = {key: self._resolve(value, variables) for key, value in item.items() if key not in ["draw", "when"]}
+        width, height = self.size
+        arguments["x"] = width // 2 + arguments.get("x", 0) + offset[0]
+        arguments["y"] = height // 2 + arguments.get("y", 0) + offset[1]
+        getattr(draw, f"_draw_{item['draw']}")(image, **arguments)
+
+    def create_card_image(self, attributes=None):
+        """
+        Return the display list of a card (with the given attributes, if its
+        background or items use them) without figures.
+        """
+        attributes = attributes or {}
+        variables = self._variables(attributes)
+        image = draw._DisplayList(*self.size, variables["background"])
+        for item in self.spec["card"].get("items", []):
+            self._draw(image, item, variables, attributes)
+        return image
+
+    def offsets(self, attributes):
+        """
+        Return the offsets from the card center of the figures of the card
+        with the given attributes.
+        """
+        layout = self.spec.get("layout")
+        if not layout:
+            return [(0, 0)]
+        key = ",".join(str(attributes[name]) for name in layout["axes"])
+        return [tuple(offset) for offset in layout["offsets"][key]]
+
+    def draw_figure(self, image, attributes, offset=(0, 0)):
+        """
+        Record the figure of the card with the given attributes on the display
+        list, at offset from the card center.
+        """
+        figures = self.spec["figures"]
+        items = figures["items"][str(attributes[figures["axis"]])] if "axis" in figures else figures["items"]
+        variables = self._variables(attributes)
+        for item in items:
+            self._draw(image, item, variables, attributes, offset)
+
+    def card_display_list(self, **attributes):
+        image = self.create_card_image(attributes)
+        for offset in self.offsets(attributes):
+            self.draw_figure(image, attributes, offset)
+        return image
+
+    def draw_card(self, scale=1, **attributes):
+        return draw._render_display_list(self.card_display_list(**attributes), scale=scale)
+
+    def _figures_display_list(self, figures):
+        image = self.create_card_image()
+        for figure in figures:
+            self.draw_figure(image, figure["attributes"], figure.get("offset", (0, 0)))
+        return image
+
+    def extras(self):
+        """
+        Return the (name, display_list) of each of the spec's extras.
+        """
+        return [(name, self._figures_display_list(figures)) for name, figures in self.spec.get("extras", {}).items()]
+
+    def icon_display_list(self):
+        """
+        Return the display list of the spec's icon.
+        """
+        return self._figures_display_list(self.spec["icon"])
+
+def load(path):
+    """
+    Compile the spec file at path (or named path in SPEC_DIRECTORY).
+    """
+    if not os.path.isabs(path) and not os.path.exists(path):
+        path = os.path.join(SPEC_DIRECTORY, path)
+    with open(path) as f:
+        return Spec(json.load(f), path)
@@ -0,0 +1,179 @@
+"""
+Persistent content-addressed sprite store, so sprites (and whole cards)
+rasterized by one build are read back by the next instead of drawn again.
+
+Set ALTERNATE_CARDS_STORE in the environment to the store directory, or to
+1 for $XDG_CACHE_HOME/alternate_cards (default ~/.cache/alternate_cards);
+build --store does so. Without it nothing is stored. draw.py then looks up
+every sprite cache miss (see draw._get_sprite) and every card it renders in
+the store before rasterizing it, and stores what it rasterizes.
+
+An entry's name is the SHA-256 of its key (the full parameter tuple of the
+sprite, as draw.py caches it in memory) and the renderer version, a hash of
+the draw.py, masks.py and coverage.py sources and the Pillow and numpy
+versions, so editing the renderer never reads back stale pixels, and the
+same sprite drawn for another variant or card is the same entry. Each entry
+is one file, {directory}/{name[:2]}/{name[2:]}, holding a small JSON header
+(the image mode and size, or the array dtype and shape) and the raw pixels,
+which are memory-mapped when read. Files are written to a temporary file
+and renamed into place, so concurrent worker processes never read a partial
+entry. Reading an entry touches its mtime; when the store grows past
+STORE_BUDGET bytes, the least recently used entries are deleted down to
+STORE_LOW_WATER of it.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+
+STORE_ENV = "ALTERNATE_CARDS_STORE"
+
+# Size budget of the store in bytes, and the fraction of it eviction frees
+# the store down to (so it does not evict again on the very next write).
+STORE_BUDGET = 512 * 1024 * 1024
+STORE_LOW_WATER = 0.8
+
+_MAGIC = b"ACS1"
+_ALIGN = 16
+
+def default_directory():
+    cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache, "alternate_cards")
+
+def renderer_version():
+    """
+    Return the hash of the renderer sources and libraries entries depend on.
+    """
+    import PIL
+    directory = os.path.dirname(__file__)
+    digest = hashlib.sha256()
+    for name in ["draw.py", "masks.py", "coverage.py"]:
+        with open(os.path.join(directory, name), "rb") as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    digest.update(PIL.__version__.encode())
+    try:
+        import numpy
+        digest.update(numpy.__version__.encode())
+    except ImportError:
+        pass
+    return digest.hexdigest()
+
+class Store:
+
+    def __init__(self, directory, version, budget=STORE_BUDGET):
+        self.directory = directory
+        self.version = version
+        self.budget = budget
+        self._size = None
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+    def _path(self, key):
+        name = hashlib.sha256(f"{self.version}\n{key!r}".encode()).hexdigest()
+        return os.path.join(self.directory, name[:2], name[2:])
+
+    def get(self, key):
+        """
+        Return the stored image or array for the key, or None if there is
+        none. Images and arrays are backed by the mapped file: read-only.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            os.utime(path)
+        except (FileNotFoundError, ValueError):
+            self.stats["misses"] += 1
+            return None
+        if data[:4] != _MAGIC:
+            self.stats["misses"] += 1
+            return None
+        (length,) = struct.unpack("<I", data[4:8])
+        header = json.loads(data[8:8 + length])
+        offset = -(-(8 + length) // _ALIGN) * _ALIGN
+        self.stats["hits"] += 1
+        if header["kind"] == "array":
+            import numpy as np
+            return np.frombuffer(data, dtype=header["dtype"], offset=offset).reshape(header["shape"])
+        from PIL import Image
+        mode, size = header["mode"], tuple(header["size"])
+        return Image.frombuffer(mode, size, memoryview(data)[offset:], "raw", mode, 0, 1)
+
+    def put(self, key, value):
+        """
+        Store the image or array (other values are not stored) for the key.
+        """
+        from PIL import Image
+        if isinstance(value, Image.Image):
+            header, pixels = {"kind": "image", "mode": value.mode, "size": list(value.size)}, value.tobytes()
+        elif hasattr(value, "dtype") and hasattr(value, "shape"):
+            header, pixels = {"kind": "array", "dtype": value.dtype.str, "shape": list(value.shape)}, value.tobytes()
+        else:
+            return
+        header = json.dumps(header).encode()
+        prefix = _MAGIC + struct.pack("<I", len(header)) + header
+        prefix += b"\0" * (-len(prefix) % _ALIGN)
+
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temporary = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(prefix)
+                f.write(pixels)
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+        self.stats["writes"] += 1
+        if self._size is None:
+            self._size = self.size()
+        self._size += len(prefix) + len(pixels)
+        if self._size > self.budget:
+            self.evict()
+
+    def _entries(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                yield stat.st_mtime, stat.st_size, path
+
+    def size(self):
+        """
+        Return the total size of the store's entries in bytes.
+        """
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self, budget=None):
+        """
+        Delete the least recently used entries until the store holds no more
+        than STORE_LOW_WATER of budget (default the store's) bytes.
+        """
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = (self.budget if budget is None else budget) * STORE_LOW_WATER
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            self.stats["evictions"] += 1
+        self._size = total
+
+def open_store(directory=None, budget=STORE_BUDGET):
+    """
+    Return the Store in directory ("1" or None for default_directory()) for
+    the current renderer_version().
+    """
+    if not directory or directory == "1":
+        directory = default_directory()
+    return Store(os.path.expanduser(directory), renderer_version(), budget)
@@ -0,0 +1,123 @@
+"""
+Asset catalog sync: bring the imagesets of some variants in an asset catalog
+(by default SetGame/Assets.xcassets) in line with a build output, e.g. a
+build --out into a scratch directory, or a CI artifact.
+
+For each card and extra (DUMMY) of each variant, sync_catalog() copies the
+code's images from the build output's {code}.imageset into the catalog,
+creating the imageset if it is missing, writes its Contents.json for the
+files it now holds (PNGs by scale, or one vector PDF or SVG; see vector.py)
+and deletes any other files in it, e.g. an @3x PNG no longer built. Every
+file is written through deck._write_if_changed: only if its bytes changed,
+to a temporary file renamed into place, so Xcode's incremental asset
+compilation only sees the imagesets that changed and never a half-written
+one.
+
+The catalog's build manifest (see manifest.py) records the codes written to
+it; the build output's manifest entries for the synced codes are copied
+into it, so a later build into the catalog stays incremental. With prune,
+an imageset is deleted if the manifest records its code under one of the
+variants' prefixes (e.g. ALTD_) and the variant no longer has that card.
+Nothing else is ever pruned: not DUMMY, the app icon set, the atlases and
+layers (see atlas.py and layers.py) that share the prefixes, nor imagesets
+of codes this tool did not write.
+"""
+
+import json
+import os
+import shutil
+from .deck import SCALES, _variant_spec, _write_if_changed, image_filename, imageset_contents
+from .manifest import MANIFEST_NAME, Manifest
+from .vector import vector_imageset_contents
+
+def catalog_contents():
+    """
+    Return the Contents.json text of an asset catalog, as Xcode writes it.
+    """
+    return json.dumps({"info": {"author": "xcode", "version": 1}}, indent=2, separators=(",", " : ")) + "\n"
+
+def _variant_codes(variant):
+    module = _variant_spec(variant)
+    return [code for code, _ in module.cards()] + [code for code, _ in module.extras()]
+
+def _read(file):
+    with open(file, "rb") as f:
+        return f.read()
+
+def _sync_imageset(source, catalog, code):
+    """
+    Copy the code's imageset from the build output source into the catalog
+    and return the number of files written or deleted, or None if the build
+    output has no images for it.
+    """
+
+    files = {}
+    for scale in SCALES:
+        filename = image_filename(code, scale)
+        if os.path.exists(f"{source}/{code}.imageset/{filename}"):
+            files[filename] = scale
+    if files:
+        contents = imageset_contents(code, list(files.values()))
+    else:
+        vectors = [f"{code}.{format}" for format in ["pdf", "svg"]
+                   if os.path.exists(f"{source}/{code}.imageset/{code}.{format}")]
+        if not vectors:
+            return None
+        files = {vectors[0]: None}
+        contents = vector_imageset_contents(vectors[0])
+
+    imageset = f"{catalog}/{code}.imageset"
+    os.makedirs(imageset, exist_ok=True)
+    changed = 0
+    for filename in files:
+        changed += _write_if_changed(f"{imageset}/{filename}", _read(f"{source}/{code}.imageset/{filename}"))
+    changed += _write_if_changed(f"{imageset}/Contents.json", contents.encode())
+    for filename in sorted(os.listdir(imageset)):
+        if filename not in files and filename != "Contents.json":
+            os.remove(f"{imageset}/{filename}")
+            print(f"{imageset}/{filename} (deleted)")
+            changed += 1
+    return changed
+
+def sync_catalog(source, catalog, variants, prune=True, manifest_path=None):
+    """
+    Sync the imagesets of the variants (VARIANTS names such as "ALTD") from
+    the build output directory source into the asset catalog directory and
+    return a dictionary of, by variant, a dictionary of the number of
+    imagesets synced, files written (or deleted), imagesets pruned and codes
+    missing from the build output. manifest_path is the catalog's manifest
+    (default: MANIFEST_NAME in the catalog).
+    """
+
+    os.makedirs(catalog, exist_ok=True)
+    if not os.path.exists(f"{catalog}/Contents.json"):
+        _write_if_changed(f"{catalog}/Contents.json", catalog_contents().encode())
+    manifest = Manifest(manifest_path or os.path.join(catalog, MANIFEST_NAME))
+    built = Manifest(os.path.join(source, MANIFEST_NAME))
+
+    results = {}
+    try:
+        for variant in variants:
+            codes = _variant_codes(variant)
+            result = results[variant] = {"imagesets": 0, "written": 0, "pruned": 0, "missing": []}
+            for code in codes:
+                changed = _sync_imageset(source, catalog, code)
+                if changed is None:
+                    result["missing"].append(code)
+                    continue
+                result["imagesets"] += 1
+                result["written"] += changed
+                manifest.adopt(built, code)
+            if prune:
+                current = set(codes)
+                for code in sorted(manifest.codes()):
+                    if code.startswith(f"{variant}_") and code not in current:
+                        imageset = f"{catalog}/{code}.imageset"
+                        if os.path.isdir(imageset):
+                            shutil.rmtree(imageset)
+                            print(f"{imageset} (pruned)")
+                            result["pruned"] += 1
+                        manifest.forget(code)
+    finally:
+        manifest.save()
+    return results
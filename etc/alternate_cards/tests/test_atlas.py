@@ -0,0 +1,34 @@
+import json
+from PIL import Image
+from alternate_cards.atlas import PADDING, build_atlas, pack_atlas
+
+SIZES = [(f"C{index}", (200, 240 if index % 3 else 300)) for index in range(20)] + [("WIDE", (410, 100))]
+
+def test_pack_atlas_rects_fit_without_overlap():
+    (width, height), rects = pack_atlas(SIZES)
+    assert sorted(rects) == sorted(code for code, _ in SIZES)
+    for code, size in SIZES:
+        x, y, w, h = rects[code]
+        assert (w, h) == size and x >= 0 and y >= 0 and x + w <= width and y + h <= height
+    boxes = list(rects.values())
+    for i, (x1, y1, w1, h1) in enumerate(boxes):
+        for x2, y2, w2, h2 in boxes[:i]:
+            assert (x1 + w1 + PADDING <= x2 or x2 + w2 + PADDING <= x1
+                    or y1 + h1 + PADDING <= y2 or y2 + h2 + PADDING <= y1)
+
+def test_build_atlas_index_matches_codes(tmp_path):
+    from alternate_cards.deck import build_deck, write_deck
+    results = build_deck("ALTD", scales=(1, 2), skip={"ALTD_ROH1"})
+    write_deck(results, str(tmp_path))
+    codes = [code for code, _ in results]
+    build_atlas(str(tmp_path), "ALTD", codes, (1, 2))
+    with open(tmp_path / "ALTD_ATLAS.dataset" / "ALTD_ATLAS.json") as f:
+        index = json.load(f)
+    assert list(index["cards"]) == codes
+    assert index["scales"] == [1, 2]
+    assert all(rect[2:] == [200, 240] for rect in index["cards"].values())
+    x, y, w, h = index["cards"]["ALTD_GQS3"]
+    with Image.open(tmp_path / "ALTD_ATLAS.imageset" / "ALTD_ATLAS@2x.png") as atlas, \
+         Image.open(tmp_path / "ALTD_GQS3.imageset" / "ALTD_GQS3@2x.png") as card:
+        crop = atlas.convert("RGB").crop((2 * x, 2 * y, 2 * (x + w), 2 * (y + h)))
+        assert crop.tobytes() == card.convert("RGB").tobytes()
@@ -0,0 +1,15 @@
+import numpy as np
+from alternate_cards.draw import _DisplayList, _draw_circle, _draw_triangle, _render_display_list
+
+def _card():
+    display_list = _DisplayList(200, 240, "white")
+    _draw_circle(display_list, 60, 60, 30, "#2D34A1", border=6, border_color="black")
+    _draw_triangle(display_list, 140, 150, 40, "#9C3327", border=6, border_color="black", flip=True)
+    return display_list
+
+def test_numpy_backend_replays_triangles():
+    pil = np.asarray(_render_display_list(_card()), dtype=np.int16)
+    numpy = np.asarray(_render_display_list(_card(), backend="numpy"), dtype=np.int16)
+    assert pil.shape == numpy.shape
+    # The backends rasterize differently, so only where they paint is compared.
+    assert (np.abs(pil - numpy).max(axis=2) > 64).mean() < 0.02
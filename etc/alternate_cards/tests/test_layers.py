@@ -0,0 +1,10 @@
+import json
+from alternate_cards import spec
+from alternate_cards.layers import _layer_images
+
+def test_layers_use_the_spec_tint():
+    with open(spec.load("boxes.json").path) as f:
+        module = spec.Spec(dict(json.load(f), tint=0.3))
+    color = module.COLORS[0]
+    display_list = module.card_display_list(number=0, color=color, shape="oval", filling="stripe")
+    assert sorted(_layer_images(display_list, color, module.tint, 1)) == ["outer", "tint"]
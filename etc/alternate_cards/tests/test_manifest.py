@@ -0,0 +1,31 @@
+from alternate_cards import draw
+from alternate_cards.deck import _variant_spec
+from alternate_cards.manifest import render_inputs
+
+def test_render_inputs_ignore_store_and_caches(monkeypatch):
+    module = _variant_spec("ALTD")
+    inputs = render_inputs(module)
+    monkeypatch.setattr(draw, "STORE", not draw.STORE)
+    monkeypatch.setattr(draw, "SPRITE_CACHE_SIZE", draw.SPRITE_CACHE_SIZE * 2)
+    monkeypatch.setattr(draw, "TEMPLATE_CACHE_SIZE", draw.TEMPLATE_CACHE_SIZE * 2)
+    assert render_inputs(module) == inputs
+
+def test_render_inputs_follow_pixel_globals(monkeypatch):
+    module = _variant_spec("ALTD")
+    inputs = render_inputs(module)
+    monkeypatch.setattr(draw, "BORDER_MODE", "inset")
+    assert render_inputs(module) != inputs
+
+def _build(out, capsys):
+    from alternate_cards.cli import build
+    build(["ALTD"], str(out), jobs=1, scales=[1])
+    return capsys.readouterr().err.splitlines()[-1]
+
+def test_build_skips_unchanged_and_rebuilds_dirty(tmp_path, capsys):
+    assert _build(tmp_path, capsys).startswith("ALTD: 81 cards, 81 rendered,")
+    assert _build(tmp_path, capsys) == "ALTD: 81 cards, 0 rendered, 0 written"
+    with open(tmp_path / "ALTD_ROH1.imageset" / "ALTD_ROH1.png", "ab") as f:
+        f.write(b"\0")
+    (tmp_path / "ALTD_GQS3.imageset" / "ALTD_GQS3.png").unlink()
+    assert _build(tmp_path, capsys) == "ALTD: 81 cards, 2 rendered, 2 written"
+    assert _build(tmp_path, capsys) == "ALTD: 81 cards, 0 rendered, 0 written"
@@ -0,0 +1,14 @@
+from alternate_cards.deck import _variant_spec, build_deck, catalog_files
+from alternate_cards.pipeline import build_deck_pipelined
+
+def test_pipeline_matches_build_deck(tmp_path):
+    codes = [code for code, _ in _variant_spec("ALTC").cards()]
+    skip = set(codes[1::4])
+    results, written, _ = build_deck_pipelined("ALTC", str(tmp_path), skip=skip, scales=(1, 2))
+    expected = build_deck("ALTC", jobs=2, skip=skip, scales=(1, 2))
+    assert results == expected
+    assert written == 3 * len(expected)
+    for code, images in expected:
+        for file, scale in zip(catalog_files(str(tmp_path), code, (1, 2)), (1, 2)):
+            with open(file, "rb") as f:
+                assert f.read() == images[scale]
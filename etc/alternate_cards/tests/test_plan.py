@@ -0,0 +1,20 @@
+import numpy as np
+from alternate_cards import draw
+from alternate_cards.plan import compile_plan
+
+def test_plan_rasterizes_each_stamp_once(monkeypatch):
+    calls = []
+    get_sprite = draw._get_sprite
+    def counting(key, render):
+        if key[0] == "stamp":
+            calls.append(key)
+        return get_sprite(key, render)
+    monkeypatch.setattr(draw, "_get_sprite", counting)
+    plan = compile_plan(["ALTD", "ALTC"], [1, 2])
+    cards = list(plan.render())
+    assert len(calls) == len(set(calls)) == plan.summary()["stamps"]
+    assert len(calls) < plan.summary()["instances"] * 2
+    for _, code, images in cards[:: 17]:
+        display_list = next(display_list for deck in plan.decks.values() for c, display_list in deck if c == code)
+        for scale, image in images.items():
+            assert np.array_equal(np.asarray(image), np.asarray(draw._render_display_list(display_list, scale=scale)))
@@ -0,0 +1,19 @@
+import numpy as np
+from PIL import ImageColor
+from alternate_cards.deck import _variant_spec
+from alternate_cards.draw import _lighten_color, _render_display_list
+from alternate_cards.recolor import TINT, anchors, deck_colors, recolor_image
+
+def test_white_only_remap_keeps_figure_colors():
+    module = _variant_spec("ALTD")
+    pairs = anchors({"white": "#202020"}, TINT, deck_colors(module))
+    for color in module.COLORS:
+        for filling in module.FILLINGS:
+            display_list = module.card_display_list(number=0, color=color, shape=module.SHAPES[0], filling=filling)
+            image = np.asarray(_render_display_list(display_list))
+            recolored = np.asarray(recolor_image(_render_display_list(display_list), pairs))
+            for flat in [color, _lighten_color(color, TINT)]:
+                where = (image == ImageColor.getrgb(flat)).all(axis=2)
+                assert where.any() or flat != color
+                assert (recolored[where] == image[where]).all()
+            assert (recolored[0, 0] == ImageColor.getrgb("#202020")).all()
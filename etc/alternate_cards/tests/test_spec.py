@@ -0,0 +1,14 @@
+from alternate_cards.deck import _variant_spec
+
+def test_layout_by_several_axes():
+    module = _variant_spec("ALTNC")
+    for _, attributes in module.cards():
+        offsets = module.offsets(attributes)
+        assert len(offsets) == (int(attributes["number"]) + 1) * (int(attributes["column"]) + 1)
+        assert len(module.card_display_list(**attributes).items) == 1 + len(offsets)
+
+def test_items_when_attribute_values():
+    module = _variant_spec("ALTC")
+    for filling, count in [("hollow", 5), ("stripe", 5), ("solid", 3)]:
+        display_list = module.card_display_list(number=1, color=module.COLORS[0], shape="squiggle", filling=filling)
+        assert len(display_list.items) == 1 + count
@@ -0,0 +1,23 @@
+import os
+from alternate_cards.manifest import MANIFEST_NAME, Manifest
+from alternate_cards.sync import sync_catalog
+
+def test_sync_prunes_only_recorded_codes_and_is_idempotent(tmp_path):
+    from alternate_cards.deck import build_deck, build_extras, write_deck
+    source, catalog = tmp_path / "build", tmp_path / "catalog"
+    write_deck(build_deck("ALTD", scales=(1,)) + build_extras("ALTD", (1,)), str(source))
+
+    for code in ["ALTD_GONE", "ALTD_OTHER"]:
+        os.makedirs(catalog / f"{code}.imageset")
+    manifest = Manifest(str(catalog / MANIFEST_NAME))
+    manifest.record("ALTD_GONE", None, {})
+    manifest.save()
+
+    result = sync_catalog(str(source), str(catalog), ["ALTD"])["ALTD"]
+    assert (result["imagesets"], result["pruned"], result["missing"]) == (82, 1, [])
+    assert not (catalog / "ALTD_GONE.imageset").exists()
+    assert (catalog / "ALTD_OTHER.imageset").exists() and (catalog / "DUMMY.imageset").exists()
+    assert sorted(os.listdir(catalog / "ALTD_ROH1.imageset")) == ["ALTD_ROH1.png", "Contents.json"]
+
+    result = sync_catalog(str(source), str(catalog), ["ALTD"])["ALTD"]
+    assert (result["imagesets"], result["written"], result["pruned"]) == (82, 0, 0)
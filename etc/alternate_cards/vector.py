@@ -0,0 +1,263 @@
+"""
+Vector (SVG and PDF) output of draw.py display lists.
+
+shapes() turns a display list into flat vector shapes in points (1x
+pixels), with the same geometry the raster painters use (draw._paint_*):
+an INSIDE border is the outer shape in the border color with the inset
+shape in the fill color on top, inset by the border thickness (a rounded
+rectangle's corner radius shrinks with it, a diamond's half-extents and a
+triangle's circumradius shrink by it). The raster painters' "- 1" on
+bounds is PIL's inclusive pixel convention; the areas covered are the same.
+card_svg() and card_pdf() write the shapes out, the PDF as a single page
+for the asset catalog's "Preserve Vector Data" mode.
+
+Numbers (ALTB) are text, set in the bold sans-serif of the viewer (SVG) or
+Helvetica-Bold (PDF) at the size and baseline draw._fit_font picks for the
+raster font, so their glyphs are the one part that is not identical.
+
+write_vector_deck() writes a variant's cards into an asset catalog as one
+PDF (or SVG) per imageset in place of the 1x/2x/3x PNGs.
+"""
+
+import json
+import math
+import os
+import zlib
+from PIL import ImageColor
+from .deck import _variant_spec, _write_if_changed, catalog_imageset, image_filename
+
+# Cubic Bezier control point distance for a quarter circle of radius 1.
+_KAPPA = 4 * (math.sqrt(2) - 1) / 3
+
+def _number(value):
+    text = f"{value:.3f}".rstrip("0").rstrip(".")
+    return "0" if text == "-0" else text
+
+def _rectangle(left, top, width, height, radius, color):
+    return ("rect", left, top, width, height, max(0.0, radius), color)
+
+def _ellipse(left, top, width, height, color):
+    return ("ellipse", left + width / 2, top + height / 2, width / 2, height / 2, color)
+
+def _triangle_points(left, top, radius, r, flip):
+    cx, cy = left + radius, top + radius
+    points = []
+    for degrees in [-90, 30, 150]:
+        t = math.radians(degrees)
+        x, y = cx + r * math.cos(t), cy + r * math.sin(t)
+        points.append((x, 2 * cy - y if flip else y))
+    return points
+
+def _item_shapes(item):
+    shape, left, top, *params = item
+    if shape in ["circle", "square"]:
+        radius, color, border, border_color = params
+        size = 2 * radius
+        def outline(inset, fill):
+            if shape == "circle":
+                return _ellipse(left + inset, top + inset, size - 2 * inset, size - 2 * inset, fill)
+            return _rectangle(left + inset, top + inset, size - 2 * inset, size - 2 * inset, 0, fill)
+        if border > 0 and border_color is not None:
+            yield outline(0, border_color)
+            if border < radius:
+                yield outline(border, color)
+        else:
+            yield outline(0, color)
+    elif shape == "triangle":
+        radius, color, border, border_color, flip = params
+        if border > 0 and border_color is not None:
+            yield ("polygon", _triangle_points(left, top, radius, radius, flip), border_color)
+            if radius - border > 0:
+                yield ("polygon", _triangle_points(left, top, radius, radius - border, flip), color)
+        else:
+            yield ("polygon", _triangle_points(left, top, radius, radius, flip), color)
+    elif shape == "rectangle":
+        width, height, color, border, border_color, rounding = params
+        radius = rounding * min(width, height) / 2.0
+        if border > 0 and border_color is not None:
+            yield _rectangle(left, top, width, height, radius, border_color)
+            if 2 * border < min(width, height):
+                yield _rectangle(left + border, top + border, width - 2 * border, height - 2 * border,
+                                 radius - border, color)
+        else:
+            yield _rectangle(left, top, width, height, radius, color)
+    elif shape == "diamond":
+        width, height, color, border, border_color = params
+        cx, cy = left + width / 2.0, top + height / 2.0
+        def points(hw, hh):
+            return [(cx, cy - hh), (cx + hw, cy), (cx, cy + hh), (cx - hw, cy)]
+        if border > 0 and border_color is not None:
+            yield ("polygon", points(width / 2.0, height / 2.0), border_color)
+            if width / 2.0 - border > 0 and height / 2.0 - border > 0:
+                yield ("polygon", points(width / 2.0 - border, height / 2.0 - border), color)
+        else:
+            yield ("polygon", points(width / 2.0, height / 2.0), color)
+    elif shape == "number":
+        from .draw import _fit_font
+        radius, color, number = params
+        text = str(number)
+        font, bbox = _fit_font(text, radius * 2 * 1.15, radius * 2 * 1.15)
+        tw, th = bbox[2] - bbox[0], bbox[3] - bbox[1]
+        ascent = font.getmetrics()[0]
+        # draw._draw_number places the text's ascender line; this is its baseline.
+        yield ("text", left - tw / 2, top - th / 2 - bbox[1] + ascent, font.size, tw, text, color)
+
+def shapes(display_list):
+    """
+    Return the display list as a list of vector shapes in drawing order:
+
+        ("rect", left, top, width, height, corner_radius, color)
+        ("ellipse", cx, cy, rx, ry, color)
+        ("polygon", [(x, y), ...], color)
+        ("text", left, baseline, font_size, width, text, color)
+    """
+    width, height = display_list.size
+    result = [_rectangle(0, 0, width, height, 0, display_list.background)]
+    for item in display_list.items:
+        result.extend(_item_shapes(item))
+    return result
+
+def _rgb(color):
+    return ImageColor.getrgb(color)[:3]
+
+def _svg_color(color):
+    return "#{:02X}{:02X}{:02X}".format(*_rgb(color))
+
+def card_svg(display_list):
+    """
+    Return the SVG text of the display list, sized in points.
+    """
+    width, height = display_list.size
+    lines = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">']
+    for shape in shapes(display_list):
+        kind, color = shape[0], _svg_color(shape[-1])
+        if kind == "rect":
+            _, x, y, w, h, r, _ = shape
+            corner = f' rx="{_number(r)}"' if r > 0 else ""
+            lines.append(f'<rect x="{_number(x)}" y="{_number(y)}" width="{_number(w)}" height="{_number(h)}"{corner} fill="{color}"/>')
+        elif kind == "ellipse":
+            _, cx, cy, rx, ry, _ = shape
+            lines.append(f'<ellipse cx="{_number(cx)}" cy="{_number(cy)}" rx="{_number(rx)}" ry="{_number(ry)}" fill="{color}"/>')
+        elif kind == "polygon":
+            points = " ".join(f"{_number(x)},{_number(y)}" for x, y in shape[1])
+            lines.append(f'<polygon points="{points}" fill="{color}"/>')
+        elif kind == "text":
+            _, x, y, size, w, text, _ = shape
+            lines.append(f'<text x="{_number(x)}" y="{_number(y)}" font-family="sans-serif" font-weight="bold" '
+                         f'font-size="{size}" textLength="{_number(w)}" fill="{color}">{text}</text>')
+    lines.append("</svg>")
+    return "\n".join(lines) + "\n"
+
+def _pdf_path(shape):
+    """
+    Return the PDF path operators of a shape (in top-left origin points).
+    """
+    kind = shape[0]
+    if kind == "rect":
+        _, x, y, w, h, r, _ = shape
+        r = min(r, w / 2, h / 2)
+        if r <= 0:
+            return f"{_number(x)} {_number(y)} {_number(w)} {_number(h)} re"
+        c = r * (1 - _KAPPA)
+        n = _number
+        return " ".join([
+            f"{n(x + r)} {n(y)} m", f"{n(x + w - r)} {n(y)} l",
+            f"{n(x + w - c)} {n(y)} {n(x + w)} {n(y + c)} {n(x + w)} {n(y + r)} c", f"{n(x + w)} {n(y + h - r)} l",
+            f"{n(x + w)} {n(y + h - c)} {n(x + w - c)} {n(y + h)} {n(x + w - r)} {n(y + h)} c", f"{n(x + r)} {n(y + h)} l",
+            f"{n(x + c)} {n(y + h)} {n(x)} {n(y + h - c)} {n(x)} {n(y + h - r)} c", f"{n(x)} {n(y + r)} l",
+            f"{n(x)} {n(y + c)} {n(x + c)} {n(y)} {n(x + r)} {n(y)} c", "h"])
+    if kind == "ellipse":
+        _, cx, cy, rx, ry, _ = shape
+        kx, ky = rx * _KAPPA, ry * _KAPPA
+        n = _number
+        return " ".join([
+            f"{n(cx + rx)} {n(cy)} m",
+            f"{n(cx + rx)} {n(cy + ky)} {n(cx + kx)} {n(cy + ry)} {n(cx)} {n(cy + ry)} c",
+            f"{n(cx - kx)} {n(cy + ry)} {n(cx - rx)} {n(cy + ky)} {n(cx - rx)} {n(cy)} c",
+            f"{n(cx - rx)} {n(cy - ky)} {n(cx - kx)} {n(cy - ry)} {n(cx)} {n(cy - ry)} c",
+            f"{n(cx + kx)} {n(cy - ry)} {n(cx + rx)} {n(cy - ky)} {n(cx + rx)} {n(cy)} c", "h"])
+    if kind == "polygon":
+        points = shape[1]
+        return " ".join([f"{_number(points[0][0])} {_number(points[0][1])} m"]
+                        + [f"{_number(x)} {_number(y)} l" for x, y in points[1:]] + ["h"])
+
+def card_pdf(display_list):
+    """
+    Return the bytes of a single-page PDF of the display list, with a page
+    the size of the card in points.
+    """
+
+    width, height = display_list.size
+    # Flip to a top-left origin, as in the display list.
+    operators = [f"1 0 0 -1 0 {height} cm"]
+    font = False
+    for shape in shapes(display_list):
+        r, g, b = (_number(value / 255) for value in _rgb(shape[-1]))
+        operators.append(f"{r} {g} {b} rg")
+        if shape[0] == "text":
+            _, x, y, size, _, text, _ = shape
+            font = True
+            # Unflip the glyphs.
+            operators.append(f"BT /F1 {size} Tf 1 0 0 -1 {_number(x)} {_number(y)} Tm ({text}) Tj ET")
+        else:
+            operators.append(f"{_pdf_path(shape)} f")
+    content = zlib.compress("\n".join(operators).encode(), 9)
+
+    resources = "<< /Font << /F1 5 0 R >> >>" if font else "<< >>"
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {width} {height}] /Resources {resources} /Contents 4 0 R >>".encode(),
+        f"<< /Length {len(content)} /Filter /FlateDecode >>\nstream\n".encode() + content + b"\nendstream",
+    ]
+    if font:
+        objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold >>")
+
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        pdf += f"{offset:010d} 00000 n \n".encode()
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(pdf)
+
+def vector_imageset_contents(filename):
+    """
+    Return the Contents.json text of an imageset holding one vector image,
+    with "Preserve Vector Data" on, formatted as Xcode writes it.
+    """
+    contents = {"images": [{"filename": filename, "idiom": "universal"}],
+                "info": {"author": "xcode", "version": 1},
+                "properties": {"preserves-vector-representation": True}}
+    return json.dumps(contents, indent=2, separators=(",", " : ")) + "\n"
+
+def write_vector_deck(directory, variant, format="pdf"):
+    """
+    Write every card of the variant (a VARIANTS name such as "ALTD") into the
+    asset catalog directory as {code}.imageset/{code}.pdf (or .svg), removing
+    the card's PNGs (or other vector file) there, and return the number of
+    files written.
+    """
+
+    module = _variant_spec(variant)
+    cards = [(code, module.card_display_list(**attributes)) for code, attributes in module.cards()]
+    cards += module.extras()
+
+    written = 0
+    for code, display_list in cards:
+        imageset = catalog_imageset(directory, code)
+        data = card_pdf(display_list) if format == "pdf" else card_svg(display_list).encode()
+        filename = f"{code}.{format}"
+        written += _write_if_changed(f"{imageset}/{filename}", data)
+        written += _write_if_changed(f"{imageset}/Contents.json", vector_imageset_contents(filename).encode())
+        other = "svg" if format == "pdf" else "pdf"
+        for file in [image_filename(code, scale) for scale in [1, 2, 3]] + [f"{code}.{other}"]:
+            file = f"{imageset}/{file}"
+            if os.path.exists(file):
+                os.remove(file)
+                print(f"removed {file}")
+    return written